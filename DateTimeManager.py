@@ -1,4 +1,4 @@
-from imports import *
+import datetime
 
 date_today = ""
 date_today_dash_format = ""
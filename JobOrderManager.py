@@ -1,5 +1,13 @@
 # %%
-from imports import *
+# Importing this module does no I/O; the Excel reader is loaded on the first workbook read.
+# The state lives in a thread-safe JobOrderService; the functions below are thin
+# wrappers that mirror its results into the module globals for older callers.
+import datetime
+import os
+from src.config import JOB_ORDER_DIR, JOB_ORDER_CSV, JOB_ORDER_CACHE_CONFIG
+from src.utils.material_reader import read_material_column
+from src.utils.job_order_service import JobOrderService
+from src.database.config import MATERIAL_MIRROR_CONFIG
 
 # %%
 data_frames = []
@@ -7,100 +15,88 @@ data_frame_prev_data = []
 
 read_rows = 0
 read_job_order = ""
-job_order_materials = ""
+job_order_materials = frozenset()
 
 is_line_in = ""
 
+# %%
+def material_list_candidates(job_order):
+    current_year = datetime.datetime.now().year
+    previous_year = current_year - 1
+
+    return [
+        fr'\\192.168.2.19\production\{current_year}$\1. Document for Production Admin\8. JOB ORDER MATERIAL LIST\{job_order}.xlsx',
+        fr'\\192.168.2.19\production\{current_year}\1. Document for Production Admin\8. JOB ORDER MATERIAL LIST\{job_order}.xlsx',
+        fr'\\192.168.2.19\{previous_year}$\1. Document for Production Admin\8. JOB ORDER MATERIAL LIST\{job_order}.xlsx',
+        fr'\\192.168.2.19\{previous_year}\1. Document for Production Admin\8. JOB ORDER MATERIAL LIST\{job_order}.xlsx',
+    ]
+
+def material_list_directories():
+    return [os.path.dirname(file_path) for file_path in material_list_candidates("")]
+
+def read_material_list(file_path):
+    # Only the Material column is read; calamine with an openpyxl fallback.
+    # The frozenset gives O(1) membership checks on the detection path.
+    return read_material_column(file_path, "Material")
+
+service = JobOrderService(
+    os.path.join(JOB_ORDER_DIR, JOB_ORDER_CSV),
+    material_list_candidates,
+    read_material_list,
+    revalidate_interval=JOB_ORDER_CACHE_CONFIG['revalidate_interval'],
+    negative_ttl=JOB_ORDER_CACHE_CONFIG['negative_ttl'],
+    current_negative_ttl=JOB_ORDER_CACHE_CONFIG['current_negative_ttl'],
+)
+
 # %%
 def check_job_orders():
-    global data_frames
-    global data_frame_prev_data
-    global read_rows
     global read_job_order
 
-    global is_line_in
-
-    read_rows = 0
-    read_job_order = ""
-
-    pd.set_option('display.max_columns', None)
-    pd.set_option('display.max_rows', None)
-
-    main_dir = r'\\192.168.2.19\ai_team\AI Program\Outputs\JobOrder'
-    os.chdir(main_dir)
-    data_frames = pd.read_csv('JobOrderSerials.csv', encoding='latin1')
-
-    read_job_order = data_frames["Job Order No"].tail(1).values[0]
+    read_job_order = service.current_job_order()
     return read_job_order
 
-# %%
+def resolve_material_list(job_order):
+    return service.resolve_path(job_order)
+
 def find_materials():
     global job_order_materials
     global read_job_order
 
-    
-    current_year = datetime.datetime.now().year
+    result = service.lookup()
+    read_job_order = result.job_order
+    job_order_materials = result.materials
+    return result
 
-    
-    folder_name_current_with_dollar = f"{current_year}$"
-    folder_name_current_without_dollar = f"{current_year}"
+def cache_stats():
+    return service.cache_stats()
 
-    
-    file_path_current_with_dollar = fr'\\192.168.2.19\production\{folder_name_current_with_dollar}\1. Document for Production Admin\8. JOB ORDER MATERIAL LIST\{read_job_order}.xlsx'
+# %%
+def start_prefetcher():
+    # Load upcoming job orders' material lists in the background
+    return service.start_prefetcher(
+        lookahead=JOB_ORDER_CACHE_CONFIG['prefetch_lookahead'],
+        interval=JOB_ORDER_CACHE_CONFIG['prefetch_interval'],
+    )
 
-    
-    if os.path.exists(file_path_current_with_dollar):
-        try:
-            job_order_materials = pd.read_excel(file_path_current_with_dollar)
-            if "Material" in job_order_materials.columns:
-                job_order_materials = job_order_materials["Material"]
-            else:
-                print(f"'Material' column not found in the file: {file_path_current_with_dollar}")
-        except Exception as e:
-            print(f"Error reading file in current year with dollar sign: {e}")
-    else:
-        
-        file_path_current_without_dollar = fr'\\192.168.2.19\production\{folder_name_current_without_dollar}\1. Document for Production Admin\8. JOB ORDER MATERIAL LIST\{read_job_order}.xlsx'
-        if os.path.exists(file_path_current_without_dollar):
-            try:
-                job_order_materials = pd.read_excel(file_path_current_without_dollar)
-                if "Material" in job_order_materials.columns:
-                    job_order_materials = job_order_materials["Material"]
-                else:
-                    print(f"'Material' column not found in the file: {file_path_current_without_dollar}")
-            except Exception as e:
-                print(f"Error reading file in current year without dollar sign: {e}")
-        else:
-            
-            previous_year = current_year - 1
-            folder_name_prev_with_dollar = f"{previous_year}$"
-            folder_name_prev_without_dollar = f"{previous_year}"
-
-            
-            file_path_prev_with_dollar = fr'\\192.168.2.19\{folder_name_prev_with_dollar}\1. Document for Production Admin\8. JOB ORDER MATERIAL LIST\{read_job_order}.xlsx'
-            if os.path.exists(file_path_prev_with_dollar):
-                try:
-                    job_order_materials = pd.read_excel(file_path_prev_with_dollar)
-                    if "Material" in job_order_materials.columns:
-                        job_order_materials = job_order_materials["Material"]
-                    else:
-                        print(f"'Material' column not found in the file: {file_path_prev_with_dollar}")
-                except Exception as e:
-                    print(f"Error reading file in previous year with dollar sign: {e}")
-            else:
-                
-                file_path_prev_without_dollar = fr'\\192.168.2.19\{folder_name_prev_without_dollar}\1. Document for Production Admin\8. JOB ORDER MATERIAL LIST\{read_job_order}.xlsx'
-                if os.path.exists(file_path_prev_without_dollar):
-                    try:
-                        job_order_materials = pd.read_excel(file_path_prev_without_dollar)
-                        if "Material" in job_order_materials.columns:
-                            job_order_materials = job_order_materials["Material"]
-                        else:
-                            print(f"'Material' column not found in the file: {file_path_prev_without_dollar}")
-                    except Exception as e:
-                        print(f"Error reading file in previous year without dollar sign: {e}")
-                else:
-                    print(f"File not found: {file_path_current_with_dollar}, {file_path_current_without_dollar}, {file_path_prev_with_dollar}, and {file_path_prev_without_dollar}")
+def stop_prefetcher():
+    service.stop_prefetcher()
+
+# %%
+def start_mirror():
+    # Keep a local SQLite copy of the material list directories in sync
+    if not MATERIAL_MIRROR_CONFIG['enabled']:
+        return None
+    from src.database.material_mirror import MaterialMirror
+
+    return service.start_mirror(MaterialMirror(
+        MATERIAL_MIRROR_CONFIG['path'],
+        material_list_directories,
+        read_material_list,
+        MATERIAL_MIRROR_CONFIG['sync_interval'],
+    ))
+
+def stop_mirror():
+    service.stop_mirror()
 
 # %%
 # def write_done_in_job_order():
@@ -127,13 +123,3 @@ def find_materials():
 #         new_val = pd.concat([data_frame_prev_data, data_frames], axis=0, ignore_index=True)
 #         wire_frame = new_val
 #         wire_frame.to_csv('JobOrderSerials.csv', index=False)
-
-# %%
-# DTManager.GetDateToday()
-check_job_orders()
-read_job_order
-find_materials()
-job_order_materials
-
-
-
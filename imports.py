@@ -1,28 +1,50 @@
-from pathlib import Path
-import shutil
+"""
+Shared imports for the script-style modules.
+
+Heavy third-party modules are imported on first attribute access
+(``imports.pd``), so importing this module is cheap. ``from imports import *``
+still binds every name and therefore imports all of them; new code should
+import what it needs directly.
+"""
+import datetime
 import glob
-import pandas as pd
-import os
-import numpy as np
+import importlib
+import logging
 import math
-import openpyxl
-import datetime
-import time
-from openpyxl.styles import Font
-import pyttsx3
-from python_calamine import CalamineWorkbook
-import xlrd
-import keyboard
+import os
+import shutil
 import threading
-import serial
 import time
-import logging
-# Tkinter
-from tkinter import *
-import tkinter as tk
-from tkinter import ttk
+from pathlib import Path
+
+# Name -> module path, or (module path, attribute)
+_LAZY = {
+    'pd': 'pandas',
+    'np': 'numpy',
+    'openpyxl': 'openpyxl',
+    'Font': ('openpyxl.styles', 'Font'),
+    'pyttsx3': 'pyttsx3',
+    'CalamineWorkbook': ('python_calamine', 'CalamineWorkbook'),
+    'xlrd': 'xlrd',
+    'keyboard': 'keyboard',
+    'serial': 'serial',
+    'tk': 'tkinter',
+    'ttk': 'tkinter.ttk',
+    'windll': ('ctypes', 'windll'),
+    'pygame': 'pygame',
+}
+
+__all__ = ['Path', 'shutil', 'glob', 'os', 'math', 'datetime', 'time', 'threading', 'logging', *_LAZY]
 
-# Fixing Blur UI
-from ctypes import windll
 
-import pygame
\ No newline at end of file
+def __getattr__(name):
+    """Import a heavy module the first time it is used."""
+    target = _LAZY.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if isinstance(target, tuple):
+        value = getattr(importlib.import_module(target[0]), target[1])
+    else:
+        value = importlib.import_module(target)
+    globals()[name] = value
+    return value
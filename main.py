@@ -1,16 +1,28 @@
 """
 Main entry point for the Wrong Material Detector application.
 """
-from src.ui.main_window import MainWindow
 from src.models.process import Process
 from src.controllers.process_controller import ProcessController
+from src.controllers.async_process_controller import AsyncProcessController
 from src.controllers.plc_controller import PLCController
+from src.models.validation_plan import compile_validation_plans
 from src.utils.sound import SoundManager
-from src.config import PROCESS_CONFIGS, SOUND_PATH, SERIAL_PORT, SERIAL_BAUD
-from ctypes import windll
+from src.utils.sound_bank import SoundBank
+from src.utils.phrase_cache import PhraseCache
+from src.utils.replay import Recorder, attach_recorder
+from src.utils.metrics import start_metrics_server
+from src.utils.profiling import PROFILER
+from src.config import (PROCESS_CONFIGS, SOUND_TITLES, SOUND_PATH, SOUND_CACHE_PATH, TTS_CACHE_PATH,
+                        TTS_CONFIG, SERIAL_PORT, SERIAL_BAUD, ENGINE_CONFIG, RECORD_CONFIG,
+                        METRICS_CONFIG, PROFILING_CONFIG)
+import JobOrderManager
 
 def main():
     """Initialize and start the application."""
+    # Windows and the UI toolkit are only needed when the application runs
+    from ctypes import windll
+    from src.ui.main_window import MainWindow
+    
     windll.shcore.SetProcessDpiAwareness(1)
     
     # Create process instances
@@ -19,12 +31,40 @@ def main():
         for num, config in PROCESS_CONFIGS.items()
     }
     
+    # Compile validation rules once so each row is a few set lookups
+    validation_plans = compile_validation_plans(PROCESS_CONFIGS, SOUND_TITLES)
+    
     # Initialize controllers
-    sound_manager = SoundManager(SOUND_PATH)
-    process_controller = ProcessController(processes, sound_manager)
+    phrase_cache = PhraseCache(TTS_CACHE_PATH, TTS_CONFIG['cache_capacity'])
+    sound_manager = SoundManager(SOUND_PATH, SoundBank(SOUND_PATH, SOUND_CACHE_PATH, SOUND_TITLES), phrase_cache)
+    # Render every announcement in the background so speaking never synthesizes
+    phrase_cache.prewarm(
+        [check.phrase for plan in validation_plans.values() for check in plan.checks],
+        TTS_CONFIG['rate']
+    )
+    controller_class = AsyncProcessController if ENGINE_CONFIG['engine'] == 'asyncio' else ProcessController
+    process_controller = controller_class(processes, sound_manager, validation_plans)
+    recorder = None
+    if RECORD_CONFIG['path']:
+        # Capture the day's traffic for tools/replay.py
+        recorder = Recorder(RECORD_CONFIG['path'])
+        attach_recorder(process_controller, recorder)
     plc_controller = PLCController(SERIAL_PORT, SERIAL_BAUD, processes)
     
+    # Detection latency histograms for Prometheus
+    metrics_server = None
+    if METRICS_CONFIG['enabled']:
+        try:
+            metrics_server = start_metrics_server(METRICS_CONFIG['host'], METRICS_CONFIG['port'])
+        except OSError as e:
+            print(f"Failed to start metrics server: {e}")
+    
+    if PROFILING_CONFIG['capture_on_start']:
+        PROFILER.start_capture(PROFILING_CONFIG['capture_on_start'])
+    
     # Start controllers
+    JobOrderManager.start_mirror()
+    JobOrderManager.start_prefetcher()
     plc_controller.start()
     process_controller.start_monitoring()
     
@@ -32,6 +72,13 @@ def main():
     def on_stop():
         process_controller.stop_monitoring()
         plc_controller.stop()
+        JobOrderManager.stop_prefetcher()
+        JobOrderManager.stop_mirror()
+        if recorder:
+            recorder.close()
+        if metrics_server:
+            metrics_server.shutdown()
+        PROFILER.finish_capture()
         
     window = MainWindow(processes, on_stop)
     window.run()
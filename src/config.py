@@ -9,10 +9,60 @@ DEBUG = False
 # Base paths
 BASE_CSV_PATH = r'\\192.168.2.10\csv\csv'
 SOUND_PATH = r'\\192.168.2.19\ai_team\AI Program\Programs\Individual Program\Sounds'
+# Local mirror of SOUND_PATH so alarms keep working when the share is slow or offline
+LOCAL_DATA_PATH = os.path.join(os.getenv('LOCALAPPDATA', os.path.expanduser('~')), 'WrongMaterialDetector')
+SOUND_CACHE_PATH = os.path.join(LOCAL_DATA_PATH, 'Sounds')
+TTS_CACHE_PATH = os.path.join(LOCAL_DATA_PATH, 'Speech')
+
+# Job order configuration
+JOB_ORDER_DIR = r'\\192.168.2.19\ai_team\AI Program\Outputs\JobOrder'
+JOB_ORDER_CSV = 'JobOrderSerials.csv'
+JOB_ORDER_CACHE_CONFIG = {
+    'revalidate_interval': 5.0,  # Seconds between mtime/size checks of cached files
+    'prefetch_lookahead': 3,  # Pending job orders prefetched besides the current one
+    'prefetch_interval': 2.0,  # Seconds between checks of JobOrderSerials.csv for new rows
+    'negative_ttl': 30.0,  # Seconds a job order without a material list is not looked up again
+    'current_negative_ttl': 2.0  # The same for the running job order
+}
+
+# Monitoring engine configuration
+ENGINE_CONFIG = {
+    'engine': os.getenv('WMD_ENGINE', 'threads'),  # 'threads' or 'asyncio'
+    'executor_workers': 4  # Threads for blocking DB, file and audio calls in the asyncio engine
+}
+
+# Record/replay configuration
+RECORD_CONFIG = {
+    'path': os.getenv('WMD_RECORD_PATH')  # Record process rows and material lists here, e.g. day.jsonl.gz
+}
+
+# Metrics endpoint configuration
+METRICS_CONFIG = {
+    'enabled': os.getenv('WMD_METRICS', '1') != '0',
+    'host': '127.0.0.1',  # Only reachable from the station PC
+    'port': int(os.getenv('WMD_METRICS_PORT', '9108'))
+}
+
+# Profiling configuration
+PROFILING_CONFIG = {
+    'spans': os.getenv('WMD_PROFILE_SPANS', '0') == '1',  # Time each detection stage
+    'capture_on_start': float(os.getenv('WMD_PROFILE', '0')),  # Seconds of cProfile capture at startup, 0 for none
+    'capture_seconds': 60.0,  # Capture length when started from the UI (F9)
+    'sample_rate': 0.25,  # Fraction of validations profiled during a capture
+    'output_dir': os.path.join(LOCAL_DATA_PATH, 'Profiles')
+}
 
 # Serial configuration
 SERIAL_PORT = 'COM7'  # Default COM port for PLC communication
 SERIAL_BAUD = 9600   # Default baud rate for PLC communication
+SERIAL_CONFIG = {
+    'protocol': os.getenv('PLC_PROTOCOL', 'legacy'),  # 'legacy' (single H/L byte) or 'frame' (per-process bitmask)
+    'poll_interval': 0.1,  # Seconds between checks of the process error states
+    'keepalive_interval': 1.0,  # Resend the current state this often even if unchanged
+    'read_timeout': 0.5,  # Seconds a read waits for a line from the PLC
+    'reconnect_min': 0.5,  # First delay before reopening a lost port
+    'reconnect_max': 30.0  # Upper bound of the doubling reconnect delay
+}
 
 # Process configurations
 PROCESS_CONFIGS = {
@@ -159,11 +209,35 @@ SOUND_TITLES = {
     'Process6WrongVinyl': 'Process6WrongVinyl.mp3'
 }
 
+# Sound name fragments for materials whose config name differs from the sound file
+MATERIAL_SOUND_ALIASES = {
+    'Rod Blk': 'RodBlock',
+    'Df Blk': 'DiaphragmBlock',
+    'Casing Blk': 'CSB',
+    'M4x16 Screw 1': 'M4X16Screw',
+    'M4x16 Screw 2': 'M4X16Screw',
+    'Frm Cover': 'FrameCover',
+    'Tube 1': 'BuiltInTube',
+    'Tube 2': 'BuiltInTube',
+    'Csb L': 'CasingLeft',
+    'Csb R': 'CasingRight'
+}
+
+# Text-to-speech configuration
+TTS_CONFIG = {
+    'rate': 100,  # Speech rate of announcements
+    'cache_capacity': 128,  # Rendered phrases kept on disk and in memory
+    'render_timeout': 1.0  # Seconds to wait for an uncached phrase before speaking it directly
+}
+
 # UI configurations
 UI_CONFIG = {
     'window_title': 'Wrong Material Detector',
     'window_size': '1480x500+50+50',
     'window_position': '+50+50',
     'font_normal': ('Arial', 12),
-    'font_bold': ('Arial', 12, 'bold')
+    'font_bold': ('Arial', 12, 'bold'),
+    'frame_interval_ms': 50,  # How often queued widget updates are applied
+    'log_scrollback': 500,  # Log entries kept per process
+    'log_visible_entries': 20  # Log entries rendered into the widget at once
 } 
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+asyncio-based engine for monitoring manufacturing processes.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from ..models.process import Process
+from ..models.validation_plan import ValidationPlan
+from ..utils.sound import SoundManager
+from ..database.config import POLLING_CONFIG
+from ..database.change_source import ChangeSource
+from ..config import ENGINE_CONFIG
+from .process_controller import ProcessController
+
+class AsyncProcessController(ProcessController):
+    """Runs every process monitor, timer and alarm on a single event loop.
+
+    Monitors are coroutines rather than threads, so adding stations costs no
+    extra OS threads. Blocking work (change source reads, job order lookups)
+    is offloaded to a bounded executor; alarms are played by the shared
+    AlarmManager worker, as with the threaded engine. The change source
+    gets its own single-thread executor because it keeps a persistent,
+    thread-bound database connection.
+    """
+
+    def __init__(self, processes: Dict[int, Process], sound_manager: SoundManager,
+                 validation_plans: Optional[Dict[int, ValidationPlan]] = None,
+                 change_source: Optional[ChangeSource] = None,
+                 executor_workers: int = None, job_orders: Any = None):
+        """Initialize the asyncio process controller.
+
+        Args:
+            processes: Dictionary mapping process numbers to Process objects
+            sound_manager: SoundManager instance for audio feedback
+            validation_plans: Compiled validation plans, built from PROCESS_CONFIGS if omitted
+            change_source: Source of new process rows, selected from CHANGE_FEED_CONFIG if omitted
+            executor_workers: Size of the executor for blocking calls
+            job_orders: Job order lookup, defaults to the JobOrderManager service
+        """
+        super().__init__(processes, sound_manager, validation_plans, change_source, job_orders=job_orders)
+        self.executor_workers = executor_workers or ENGINE_CONFIG['executor_workers']
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread = None
+        self._shutdown = None
+        self._executor = None
+        self._source_executor = None
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._reset_handles: Dict[int, asyncio.TimerHandle] = {}
+        self._started = threading.Event()
+
+    def start_monitoring(self):
+        """Start the event loop thread and all process monitors."""
+        print("Starting process monitoring (asyncio engine)...")
+        self.loop_thread = threading.Thread(target=self._run_loop, name="process-monitor-loop", daemon=True)
+        self.loop_thread.start()
+        self._started.wait()
+
+    def stop_monitoring(self):
+        """Stop all monitors and wait until the loop and executors have shut down."""
+        self.running = False
+        if self.loop and self._shutdown and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._shutdown.set)
+        if self.loop_thread:
+            self.loop_thread.join()
+
+    def _run_loop(self):
+        """Run the engine until shutdown."""
+        try:
+            asyncio.run(self._main())
+        finally:
+            self._started.set()
+
+    async def _main(self):
+        """Create the monitor tasks and tear everything down on shutdown."""
+        self.loop = asyncio.get_running_loop()
+        self._shutdown = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.executor_workers, thread_name_prefix="monitor-io")
+        self._source_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="change-source")
+        self._queues = {process_num: asyncio.Queue() for process_num in self.processes}
+        self.alarm_manager.start()
+
+        tasks = [asyncio.create_task(self._receive_changes_async())]
+        for process in self.processes.values():
+            tasks.append(asyncio.create_task(self._monitor_process_async(process)))
+        self._started.set()
+
+        try:
+            await self._shutdown.wait()
+        finally:
+            self.running = False
+            for handle in self._reset_handles.values():
+                handle.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            await self.loop.run_in_executor(self._source_executor, self.change_source.stop)
+            await self.loop.run_in_executor(self._executor, self.alarm_manager.stop)
+            self._source_executor.shutdown(wait=True)
+            self._executor.shutdown(wait=True)
+            print("Process monitoring stopped")
+
+    async def _receive_changes_async(self):
+        """Fan new rows from the change source out to the monitor queues."""
+        await self.loop.run_in_executor(self._source_executor, self.change_source.start)
+        while self.running:
+            try:
+                changes = await self.loop.run_in_executor(
+                    self._source_executor, self.change_source.wait_for_changes, POLLING_CONFIG['interval']
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error reading process changes: {e}")
+                await asyncio.sleep(POLLING_CONFIG['interval'])
+                continue
+
+            for process_num, rows in changes.items():
+                if process_num not in self._queues or not rows:
+                    continue
+                datetime_column = self.validation_plans[process_num].datetime_column
+                self.last_processed_datetime[process_num] = rows[-1][datetime_column]
+                seen_at = time.time()
+                for row in rows:
+                    self._observe_seen(process_num, row, seen_at)
+                    self._queues[process_num].put_nowait((row, seen_at))
+
+    async def _monitor_process_async(self, process: Process):
+        """Validate the rows of a single process in order."""
+        print(f"Monitoring process {process.process_number} from database")
+        pending = self._queues[process.process_number]
+
+        while self.running:
+            try:
+                data, seen_at = await asyncio.wait_for(pending.get(), POLLING_CONFIG['interval'])
+            except asyncio.TimeoutError:
+                # Only update dots if in loading state
+                if process.is_loading:
+                    process.update_loading_text()
+                continue
+
+            try:
+                print(f"New data detected for process {process.process_number}")
+                await self.loop.run_in_executor(self._executor, self._handle_data_change, process, data, seen_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error monitoring process {process.process_number}: {e}")
+
+    def _show_correct_temporary(self, process: Process):
+        """Show correct status temporarily, resetting it from the event loop."""
+        process.show_correct()
+        self.loop.call_soon_threadsafe(self._schedule_label_reset, process)
+
+    def _schedule_label_reset(self, process: Process):
+        """Reset the process label in 5 seconds, replacing any pending reset."""
+        handle = self._reset_handles.get(process.process_number)
+        if handle:
+            handle.cancel()
+        self._reset_handles[process.process_number] = self.loop.call_later(5.0, process.reset_label)
@@ -2,69 +2,122 @@
 Controller for PLC communication.
 """
 import threading
-import serial
-from typing import Dict
+import time
+from typing import Dict, Optional
 from ..models.process import Process
+from ..utils.serial_link import SerialLink
+from ..utils.plc_protocol import encode_frame, error_mask, mask_size
+from ..utils.metrics import PLC_LATENCY
+from ..config import SERIAL_CONFIG
 
 class PLCController:
-    """Controls communication with PLC/ESP8266 via serial port."""
+    """Controls communication with PLC/ESP8266 via serial port.
+
+    The error signal is written only when it changes, plus a keepalive every
+    ``keepalive_interval`` seconds so the ESP8266 can detect a dead link.
+    Lines received from the PLC are passed to ``_handle_plc_data``.
+
+    With ``protocol`` set to ``'legacy'`` the signal is a single ``H``/``L``
+    byte for all processes. With ``'frame'`` it is a status frame carrying one
+    error bit per process (see ``plc_protocol``), so the line can stop only
+    the affected station.
+    """
     
-    def __init__(self, port: str, baudrate: int, processes: Dict[int, Process]):
+    def __init__(self, port: str, baudrate: int, processes: Dict[int, Process], serial_config: Dict = None):
         """Initialize PLC controller.
         
         Args:
-            port: Serial port for PLC/ESP8266 communication
+            port: Serial port or pyserial URL (e.g. ``loop://``) for PLC/ESP8266 communication
             baudrate: Serial communication baudrate
             processes: Dictionary mapping process numbers to Process objects
+            serial_config: Timing settings, defaults to SERIAL_CONFIG
         """
         self.port = port
         self.baudrate = baudrate
         self.processes = processes
+        self.config = {**SERIAL_CONFIG, **(serial_config or {})}
         self.running = True
-        self.serial = None
+        self.link = SerialLink(
+            port,
+            baudrate,
+            on_line=self._handle_plc_data,
+            on_connect=self._on_connect,
+            read_timeout=self.config['read_timeout'],
+            reconnect_min=self.config['reconnect_min'],
+            reconnect_max=self.config['reconnect_max']
+        )
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.protocol = self.config['protocol']
+        self._mask_size = mask_size(processes)
+        self._sequence = 0
+        self._last_sent: Optional[int] = None
+        # Error bits the PLC has been told about, kept across reconnects
+        self._reported_errors = 0
+        self._last_write_time = 0.0
         
     def start(self):
         """Start the PLC controller and serial communication."""
-        try:
-            self.serial = serial.Serial(self.port, self.baudrate)
-            print(f"Connected to ESP8266 on {self.port} at {self.baudrate} baud")
-            threading.Thread(target=self._monitor_processes, daemon=True).start()
-        except serial.SerialException as e:
-            print(f"Failed to connect to ESP8266: {e}")
-            self.running = False
+        self.running = True
+        self._stop_event.clear()
+        self.link.start()
+        self._thread = threading.Thread(target=self._monitor_processes, name="plc-monitor", daemon=True)
+        self._thread.start()
         
     def stop(self):
         """Stop the PLC controller and close serial connection."""
         self.running = False
-        if self.serial and self.serial.is_open:
-            self.serial.write(b'L')  # Set low signal before closing
-            self.serial.close()
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+        was_connected = self.link.connected
+        self.link.stop(final_write=self._encode(0))  # Set low signal before closing
+        if was_connected:
             print("Closed ESP8266 connection")
         
     def is_running(self) -> bool:
         """Check if the PLC controller is running."""
-        return self.running and self.serial and self.serial.is_open
+        return self.running and self.link.connected
         
-    def _monitor_processes(self):
-        """Monitor processes and control ESP8266 signals."""
-        while self.running and self.serial and self.serial.is_open:
-            try:
-                # Check if any process has an error
-                has_error = any(process.has_error() for process in self.processes.values())
+    def _on_connect(self):
+        """Force the current state to be resent after the port is (re)opened."""
+        self._last_sent = None
+        
+    def _current_state(self) -> int:
+        """Error bitmask of the current process states."""
+        return error_mask({num: process.has_error() for num, process in self.processes.items()})
+        
+    def _encode(self, state: int) -> bytes:
+        """Encode an error bitmask for the configured protocol."""
+        if self.protocol == 'frame':
+            frame = encode_frame(state, self._sequence, self._mask_size)
+            self._sequence = (self._sequence + 1) & 0xFF
+            return frame
+        return b'H' if state else b'L'
+        
+    def _observe_new_errors(self, new_errors: int):
+        """Record the latency of errors that just reached the PLC."""
+        if not new_errors:
+            return
+        written_at = time.time()
+        for process_num, process in self.processes.items():
+            if new_errors & (1 << (process_num - 1)) and process.error_origin is not None:
+                PLC_LATENCY.observe(written_at - process.error_origin, process=process_num)
                 
-                # Send appropriate signal to ESP8266
-                if has_error:
-                    self.serial.write(b'H')
-                else:
-                    self.serial.write(b'L')
-                    
-                # Small delay to prevent flooding the serial port
-                threading.Event().wait(0.1)
+    def _monitor_processes(self):
+        """Monitor processes and write the ESP8266 signal on change or keepalive."""
+        while self.running:
+            state = self._current_state()
+            now = time.monotonic()
+            if state != self._last_sent or now - self._last_write_time >= self.config['keepalive_interval']:
+                if self.link.write(self._encode(state)):
+                    self._observe_new_errors(state & ~self._reported_errors)
+                    self._reported_errors = state
+                    self._last_sent = state
+                    self._last_write_time = now
                     
-            except serial.SerialException as e:
-                print(f"Serial communication error: {e}")
-                self.running = False
-                break
+            # Small delay to prevent busy-waiting; wakes at once on stop
+            self._stop_event.wait(self.config['poll_interval'])
                 
     def _handle_plc_data(self, data: str):
         """Handle data received from PLC.
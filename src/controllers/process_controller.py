@@ -2,35 +2,70 @@
 Controller for monitoring and managing manufacturing processes.
 """
 import time
+import queue
+import datetime
 import threading
-from typing import Dict, Optional
-import JobOrderManager as JOManager
+from typing import Any, Dict, Optional
 from ..models.process import Process
+from ..models.validation_plan import ValidationPlan, compile_validation_plans
 from ..utils.sound import SoundManager
+from ..utils.alarm_manager import AlarmManager
+from ..utils.profiling import PROFILER, span
+from ..utils.metrics import ROWS_SEEN, DECISIONS, POLL_DELAY, DECISION_DELAY, DETECTION_LATENCY
 from ..database.process_repository import ProcessRepository
+from ..database.config import POLLING_CONFIG
+from ..database.change_source import ChangeSource, create_change_source
 
 class ProcessController:
     """Controls and monitors manufacturing processes."""
     
-    def __init__(self, processes: Dict[int, Process], sound_manager: SoundManager):
+    def __init__(self, processes: Dict[int, Process], sound_manager: SoundManager,
+                 validation_plans: Optional[Dict[int, ValidationPlan]] = None,
+                 change_source: Optional[ChangeSource] = None,
+                 alarm_manager: Optional[AlarmManager] = None,
+                 job_orders: Any = None):
         """Initialize the process controller.
         
         Args:
             processes: Dictionary mapping process numbers to Process objects
             sound_manager: SoundManager instance for audio feedback
+            validation_plans: Compiled validation plans, built from PROCESS_CONFIGS if omitted
+            change_source: Source of new process rows, selected from CHANGE_FEED_CONFIG if omitted
+            alarm_manager: AlarmManager playing the error sounds, created if omitted
+            job_orders: Job order lookup whose lookup() returns a JobOrderMaterials,
+                defaults to the JobOrderManager service
         """
         self.processes = processes
         self.sound_manager = sound_manager
+        self.alarm_manager = alarm_manager or AlarmManager(sound_manager)
+        if job_orders is None:
+            import JobOrderManager
+            job_orders = JobOrderManager.service
+        self.job_orders = job_orders
+        self.validation_plans = validation_plans or compile_validation_plans()
         self.running = True
-        self.is_speaking = False
         self.monitor_threads = {}
+        self.poll_thread = None
         self.correct_state_timers = {}
-        self.process_repository = ProcessRepository()
+        self.process_repository = None
+        if change_source is None:
+            # Only fetch the columns the validation plans read
+            self.process_repository = ProcessRepository(
+                {process_num: plan.columns for process_num, plan in self.validation_plans.items()},
+                {process_num: plan.required_columns for process_num, plan in self.validation_plans.items()}
+            )
+            change_source = create_change_source(self.process_repository, list(processes.keys()))
+        self.change_source = change_source
         self.last_processed_datetime = {process_num: None for process_num in processes.keys()}
+        # New (row, seen_at) pairs per process, handed in order from the poller to the monitor threads
+        self.pending_rows = {process_num: queue.Queue() for process_num in processes.keys()}
         
     def start_monitoring(self):
         """Start monitoring all processes."""
         print("Starting process monitoring...")
+        self.alarm_manager.start()
+        self.poll_thread = threading.Thread(target=self._receive_changes, daemon=True)
+        self.poll_thread.start()
         for process_num, process in self.processes.items():
             thread = threading.Thread(
                 target=self._monitor_process,
@@ -43,88 +78,140 @@ class ProcessController:
     def stop_monitoring(self):
         """Stop monitoring all processes."""
         self.running = False
+        if self.poll_thread:
+            self.poll_thread.join()
         for thread in self.monitor_threads.values():
             thread.join()
+        self.alarm_manager.stop()
+            
+    def _receive_changes(self):
+        """Fan new rows from the change source out to the process monitors."""
+        self.change_source.start()
+        try:
+            while self.running:
+                try:
+                    changes = self.change_source.wait_for_changes(POLLING_CONFIG['interval'])
+                except Exception as e:
+                    print(f"Error reading process changes: {e}")
+                    time.sleep(POLLING_CONFIG['interval'])
+                    continue
+                    
+                for process_num, rows in changes.items():
+                    if process_num not in self.pending_rows or not rows:
+                        continue
+                    datetime_column = self.validation_plans[process_num].datetime_column
+                    self.last_processed_datetime[process_num] = rows[-1][datetime_column]
+                    seen_at = time.time()
+                    for row in rows:
+                        self._observe_seen(process_num, row, seen_at)
+                        self.pending_rows[process_num].put((row, seen_at))
+        finally:
+            self.change_source.stop()
         
     def _monitor_process(self, process: Process):
         """Monitor a single process for material errors."""
         print(f"Monitoring process {process.process_number} from database")
+        pending = self.pending_rows[process.process_number]
         
         while self.running:
             try:
+                data, seen_at = pending.get(timeout=POLLING_CONFIG['interval'])
+            except queue.Empty:
                 # Only update dots if in loading state
                 if process.is_loading:
                     process.update_loading_text()
+                continue
                 
-                # Get latest data from database
-                latest_data = self.process_repository.get_latest_process_data(process.process_number)
-                
-                if latest_data:
-                    datetime_column = f'Process_{process.process_number}_DateTime'
-                    current_datetime = latest_data[datetime_column]
-                    
-                    # Check if we've processed this data before
-                    if current_datetime != self.last_processed_datetime[process.process_number]:
-                        print(f"New data detected for process {process.process_number}")
-                        self._handle_data_change(process, latest_data)
-                        self.last_processed_datetime[process.process_number] = current_datetime
-                else:
-                    print(f"No data found in database for process {process.process_number}")
-                    
+            try:
+                print(f"New data detected for process {process.process_number}")
+                self._handle_data_change(process, data, seen_at)
             except Exception as e:
                 print(f"Error monitoring process {process.process_number}: {e}")
                 
-            time.sleep(1)
-                
-    def _handle_data_change(self, process: Process, data: dict):
-        """Handle changes in process data."""
+    def _row_origin(self, process_num: int, row: dict) -> Optional[float]:
+        """Epoch time the row was written, taken from its datetime column."""
+        value = row.get(self.validation_plans[process_num].datetime_column)
+        return value.timestamp() if isinstance(value, datetime.datetime) else None
+        
+    def _observe_seen(self, process_num: int, row: dict, seen_at: float):
+        """Record that the change source delivered a row."""
+        ROWS_SEEN.inc(process=process_num)
+        origin = self._row_origin(process_num, row)
+        if origin is not None:
+            POLL_DELAY.observe(seen_at - origin, process=process_num)
+            
+    def _observe_decision(self, process: Process, data: dict, seen_at: Optional[float], decision: str):
+        """Record the outcome and latency of a validation."""
+        decided_at = time.time()
+        DECISIONS.inc(process=process.process_number, decision=decision)
+        if seen_at is not None:
+            DECISION_DELAY.observe(decided_at - seen_at, process=process.process_number)
+        origin = self._row_origin(process.process_number, data)
+        if origin is not None:
+            DETECTION_LATENCY.observe(decided_at - origin, process=process.process_number)
+            
+    def _handle_data_change(self, process: Process, data: dict, seen_at: Optional[float] = None):
+        """Handle changes in process data.
+        
+        seen_at is the epoch time the change source delivered the row.
+        """
         error_detected = False
+        decision = "skipped"
+        plan = self.validation_plans[process.process_number]
         
         try:
-            repaired_action = data[f"Process {process.process_number} Repaired Action"]
-            print(f"Process {process.process_number} Repaired Action: {repaired_action}")
-            
-            if repaired_action == "-":
-                print(f"Checking job orders for process {process.process_number}")
-                JOManager.check_job_orders()
-                JOManager.find_materials()
-                
-                model_code = data[f"Process {process.process_number} Model Code"]
-                print(f"Process {process.process_number} Model Code: {model_code}")
+            with PROFILER.profile("handle_data_change"):
+                repaired_action = data[plan.repaired_action_column]
+                print(f"Process {process.process_number} Repaired Action: {repaired_action}")
                 
-                if model_code in process.model_codes:
-                    material_name_mp3 = ''
-                    for material_name, column_name in process.material_checks.items():
-                        material_code = data[column_name]
-                        if not any(material_code == valid_code for valid_code in JOManager.job_order_materials):
-                            if material_name == 'Casing Blk':
-                                material_name_mp3 = 'CSB'
+                if repaired_action == "-":
+                    print(f"Checking job orders for process {process.process_number}")
+                    with span("job_order_lookup"):
+                        job_order = self.job_orders.lookup()
+                    
+                    model_code = data[plan.model_code_column]
+                    print(f"Process {process.process_number} Model Code: {model_code}")
+                    
+                    if model_code in plan.model_codes:
+                        with span("validate"):
+                            failed_check = plan.first_invalid(data, job_order.materials)
+                        if failed_check:
                             error_detected = True
                             error_msg = f"Wrong Material Used In Process {process.process_number}"
-                            sound_title = f"Process{process.process_number}Wrong{material_name_mp3.replace(' ', '')}"
-                            process.set_error(error_msg)
-                            print(f"Error detected in process {process.process_number}: {error_msg}")
-                            self._play_error_sound(process, sound_title)
-                            break
-                            
-                if not error_detected:
-                    print(f"All materials correct for process {process.process_number}")
-                    process.reset_state()
-                    self._show_correct_temporary(process)
-                    
+                            decision = "alarm"
+                            process.set_error(error_msg, origin=self._row_origin(process.process_number, data))
+                            print(f"Error detected in process {process.process_number}: {error_msg} ({failed_check.material})")
+                            self._play_error_sound(process, failed_check.sound_key, failed_check.phrase)
+                                
+                    if not error_detected:
+                        print(f"All materials correct for process {process.process_number}")
+                        decision = "correct"
+                        if process.has_error():
+                            # A detected error stays latched until STOP or a reset from the UI
+                            print(f"Process {process.process_number} keeps its unacknowledged error")
+                        else:
+                            process.reset_state()
+                            self._show_correct_temporary(process)
+                        
         except Exception as e:
             print(f"Error checking materials for process {process.process_number}: {e}")
+            decision = "no_material"
             process.show_no_material()
+                
+        self._observe_decision(process, data, seen_at, decision)
             
-    def _play_error_sound(self, process: Process, sound_title: str):
-        """Play error sound for a process."""
-        while process.has_error() and self.running:
-            if not self.is_speaking:
-                self.is_speaking = True
-                self.sound_manager.play_mp3(sound_title)
-                print(f"Playing sound: {sound_title}")
-            time.sleep(2)
-        self.is_speaking = False
+    def _play_error_sound(self, process: Process, sound_title: Optional[str], phrase: str = None):
+        """Queue a repeating error sound for a process and return immediately.
+        
+        The phrase is spoken instead when the material has no alarm sound.
+        """
+        self.alarm_manager.submit(
+            process.process_number,
+            sound_title,
+            is_active=lambda: process.has_error() and self.running,
+            phrase=phrase,
+            origin=process.error_origin
+        )
         
     def _show_correct_temporary(self, process: Process):
         """Show correct status temporarily."""
@@ -0,0 +1,393 @@
+"""
+Change sources delivering new process rows to the process controller.
+"""
+import datetime
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+from .connection import WorkerConnection
+from .config import POLLING_CONFIG, CHANGE_FEED_CONFIG, TABLES
+from .process_repository import ProcessRepository, SchemaError, quote_identifier
+
+Changes = Dict[int, List[Dict[str, Any]]]
+
+
+class ChangeSource:
+    """Interface for components that deliver new process rows.
+
+    ``wait_for_changes`` is called in a loop from a single thread and
+    returns the rows written since the previous call, oldest first.
+    """
+
+    def start(self):
+        """Prepare the source before the first wait."""
+
+    def stop(self):
+        """Release resources and wake up a pending wait."""
+
+    def wait_for_changes(self, timeout: float) -> Changes:
+        """Wait for new rows.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Dictionary mapping process numbers to lists of new rows, which may be empty
+        """
+        raise NotImplementedError
+
+
+class PollingChangeSource(ChangeSource):
+    """Polls the process tables through ProcessRepository at a fixed interval."""
+
+    def __init__(self, repository: ProcessRepository, process_numbers: Sequence[int],
+                 mode: str = None, interval: float = None, batch_size: int = None):
+        """Initialize the polling source.
+
+        Args:
+            repository: Repository used for the batched queries
+            process_numbers: Processes to poll
+            mode: 'cursor' to fetch every new row, 'latest' for only the newest one
+            interval: Seconds between polls when there is no backlog
+            batch_size: Maximum rows per process per poll in cursor mode
+        """
+        self.repository = repository
+        self.process_numbers = list(process_numbers)
+        self.mode = mode or POLLING_CONFIG['mode']
+        self.interval = POLLING_CONFIG['interval'] if interval is None else interval
+        self.batch_size = batch_size or POLLING_CONFIG['batch_size']
+        self.cursors = None
+        self.key_columns: Dict[int, str] = {}
+        self._checked = set()
+        self.last_datetime = {process_number: None for process_number in self.process_numbers}
+        self._next_poll = 0.0
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Check that the DateTime indexes used by cursor polling exist."""
+        self._stop_event.clear()
+        if self.mode == 'cursor':
+            self.repository.check_datetime_indexes(self.process_numbers)
+
+    def stop(self):
+        """Stop waiting and release the calling thread's persistent connection."""
+        self._stop_event.set()
+        self.repository.close()
+
+    def wait_for_changes(self, timeout: float) -> Changes:
+        """Wait until the next poll is due, then poll once."""
+        delay = self._next_poll - time.monotonic()
+        if delay > 0:
+            if delay > timeout:
+                self._stop_event.wait(timeout)
+                return {}
+            if self._stop_event.wait(delay):
+                return {}
+
+        if not self._check_schema():
+            changes, has_backlog = {}, False
+        elif self.mode == 'cursor':
+            changes, has_backlog = self._poll_cursors()
+        else:
+            changes, has_backlog = self._poll_latest(), False
+
+        # Drain a backlog without waiting for the next tick
+        self._next_poll = time.monotonic() + (0 if has_backlog else self.interval)
+        return changes
+
+    def _poll_latest(self) -> Changes:
+        """Fetch the latest row of every process and keep only unseen ones."""
+        changes = {}
+        latest_rows = self.repository.get_latest_process_data_batch(self.process_numbers)
+        for process_number in self.process_numbers:
+            latest_data = latest_rows.get(process_number)
+            if not latest_data:
+                print(f"No data found in database for process {process_number}")
+                continue
+
+            current_datetime = latest_data[f'Process_{process_number}_DateTime']
+            if current_datetime != self.last_datetime[process_number]:
+                self.last_datetime[process_number] = current_datetime
+                changes[process_number] = [latest_data]
+        return changes
+
+    def _check_schema(self) -> bool:
+        """Check every process table before the first poll.
+
+        In cursor mode this also finds the unique column ordering each
+        table's rows. A process whose table lacks a required column or a
+        usable key is reported and no longer polled, since its rows could
+        not be validated or could be lost or repeated.
+
+        Returns:
+            True once every remaining process has been checked, False if the
+            database could not be inspected
+
+        Raises:
+            SchemaError: If no process can be polled
+        """
+        for process_number in list(self.process_numbers):
+            if process_number in self._checked:
+                continue
+            try:
+                if self.mode == 'cursor' and process_number not in self.key_columns:
+                    key_column = self.repository.key_column(process_number)
+                    if key_column is None:
+                        return False
+                    self.key_columns[process_number] = key_column
+                if not self.repository.check_columns(process_number):
+                    return False
+            except SchemaError as e:
+                print(f"ERROR: Process {process_number} will not be monitored: {e}")
+                self.process_numbers.remove(process_number)
+                continue
+            self._checked.add(process_number)
+        if not self.process_numbers:
+            raise SchemaError("None of the process tables can be polled")
+        return True
+
+    def _poll_cursors(self):
+        """Fetch every row written since the cursors.
+
+        Returns:
+            Tuple of the changes and whether any process has more rows waiting
+        """
+        if self.cursors is None:
+            self.cursors = self.repository.get_initial_cursors(self.process_numbers)
+            if self.cursors is None:
+                return {}, False
+
+        changes = {}
+        has_backlog = False
+        new_rows = self.repository.get_process_data_since_batch(self.cursors, self.batch_size)
+        for process_number, rows in new_rows.items():
+            if not rows:
+                continue
+            datetime_column = f'Process_{process_number}_DateTime'
+            self.cursors[process_number] = self.cursors[process_number].advance(
+                rows, datetime_column, self.key_columns[process_number]
+            )
+            changes[process_number] = rows
+            if len(rows) >= self.batch_size:
+                print(f"Catching up on backlog for process {process_number}")
+                has_backlog = True
+        return changes, has_backlog
+
+
+class ChangeLogSource(ChangeSource):
+    """Reads new rows from a trigger-maintained change log table.
+
+    An AFTER INSERT trigger on every process table copies the columns the
+    controller needs into the change log as JSON. MariaDB has no LISTEN or
+    NOTIFY, so the wait re-reads the log; each read is a primary key range
+    scan that usually returns nothing. After new entries the log is re-read
+    every ``recheck_interval`` seconds, and every empty read doubles the
+    delay up to ``idle_recheck_interval``. A stopped line therefore costs no
+    more queries than polling, while the rows of a running line arrive
+    within tens of milliseconds.
+    """
+
+    def __init__(self, repository: ProcessRepository, process_numbers: Sequence[int],
+                 table: str = None, recheck_interval: float = None,
+                 idle_recheck_interval: float = None, batch_size: int = None):
+        """Initialize the change log source.
+
+        Args:
+            repository: Repository providing the connection pool and column projections
+            process_numbers: Processes to deliver rows for
+            table: Name of the change log table
+            recheck_interval: Seconds between change log reads right after new entries
+            idle_recheck_interval: Longest delay between change log reads while idle
+            batch_size: Maximum change log entries read at once
+        """
+        self.repository = repository
+        self.process_numbers = list(process_numbers)
+        self.table = table or CHANGE_FEED_CONFIG['table']
+        self.recheck_interval = (CHANGE_FEED_CONFIG['recheck_interval']
+                                 if recheck_interval is None else recheck_interval)
+        self.idle_recheck_interval = (CHANGE_FEED_CONFIG['idle_recheck_interval']
+                                      if idle_recheck_interval is None else idle_recheck_interval)
+        self.batch_size = batch_size or CHANGE_FEED_CONFIG['batch_size']
+        self._recheck_delay = self.recheck_interval
+        self.last_id: Optional[int] = None
+        self._worker: Optional[WorkerConnection] = None
+        self._next_prune = 0.0
+        self._stop_event = threading.Event()
+
+    def install(self):
+        """Create the change log table and the insert triggers on every process table."""
+        log_table = quote_identifier(self.table)
+        self.repository.db.execute_query(f"""
+            CREATE TABLE IF NOT EXISTS {log_table} (
+                id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                process_number TINYINT UNSIGNED NOT NULL,
+                row_data LONGTEXT NOT NULL,
+                created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+                KEY idx_created_at (created_at)
+            )
+        """)
+        for process_number in self.process_numbers:
+            table_name = TABLES[f'process_{process_number}']
+            columns = self.repository.columns.get(process_number) or [f'Process_{process_number}_DateTime']
+            json_pairs = ", ".join(
+                f"'{column.replace(chr(39), chr(39) * 2)}', NEW.{quote_identifier(column)}"
+                for column in dict.fromkeys(columns)
+            )
+            trigger_name = quote_identifier(f'{table_name}_change_log')
+            self.repository.db.execute_query(f"DROP TRIGGER IF EXISTS {trigger_name}")
+            self.repository.db.execute_query(f"""
+                CREATE TRIGGER {trigger_name} AFTER INSERT ON {quote_identifier(table_name)}
+                FOR EACH ROW INSERT INTO {log_table} (process_number, row_data)
+                VALUES ({process_number}, JSON_OBJECT({json_pairs}))
+            """)
+        print(f"Change log table {self.table} and triggers installed")
+
+    def start(self):
+        """Install the triggers if configured and start after the newest entry."""
+        self._stop_event.clear()
+        if CHANGE_FEED_CONFIG['install_triggers']:
+            self.install()
+        self._worker = WorkerConnection(self.repository.db)
+
+    def stop(self):
+        """Stop waiting and release the persistent connection."""
+        self._stop_event.set()
+        if self._worker:
+            self._worker.close()
+
+    def wait_for_changes(self, timeout: float) -> Changes:
+        """Re-read the change log until entries arrive or the timeout expires."""
+        deadline = time.monotonic() + timeout
+        while not self._stop_event.is_set():
+            if self.last_id is None:
+                self.last_id = self._newest_id()
+            else:
+                changes = self._read_changes()
+                if changes:
+                    self._recheck_delay = self.recheck_interval
+                    self._prune()
+                    return changes
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._stop_event.wait(min(self._recheck_delay, remaining))
+            # Back off while the line is idle
+            self._recheck_delay = min(self._recheck_delay * 2, self.idle_recheck_interval)
+        return {}
+
+    def _newest_id(self) -> Optional[int]:
+        """Get the id of the newest change log entry, 0 for an empty log."""
+        rows = self._worker.execute(f"SELECT COALESCE(MAX(id), 0) AS last_id FROM {quote_identifier(self.table)}")
+        return int(rows[0]['last_id']) if rows else None
+
+    def _read_changes(self) -> Changes:
+        """Read the entries after ``last_id`` and group them by process.
+
+        Returns:
+            Dictionary mapping process numbers to decoded rows, oldest first
+        """
+        changes = defaultdict(list)
+        rows = self._worker.execute(
+            f"SELECT id, process_number, row_data FROM {quote_identifier(self.table)} "
+            f"WHERE id > %s ORDER BY id LIMIT %s",
+            (self.last_id, self.batch_size)
+        )
+        if not rows:
+            return {}
+        for entry in rows:
+            process_number = int(entry['process_number'])
+            if process_number in self.process_numbers:
+                changes[process_number].append(self._decode_row(process_number, entry['row_data']))
+        self.last_id = int(rows[-1]['id'])
+        return dict(changes)
+
+    @staticmethod
+    def _decode_row(process_number: int, row_data) -> Dict[str, Any]:
+        """Turn a JSON change log payload back into a process row.
+
+        Args:
+            process_number: Process number the entry belongs to
+            row_data: JSON object written by the trigger
+        """
+        if isinstance(row_data, (bytes, bytearray)):
+            row_data = row_data.decode('utf-8')
+        row = json.loads(row_data)
+        datetime_column = f'Process_{process_number}_DateTime'
+        if isinstance(row.get(datetime_column), str):
+            row[datetime_column] = datetime.datetime.fromisoformat(row[datetime_column])
+        return row
+
+    def _prune(self):
+        """Delete change log entries past the retention period, at most once an hour."""
+        now = time.monotonic()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + 3600
+        self.repository.db.execute_query(
+            f"DELETE FROM {quote_identifier(self.table)} "
+            f"WHERE created_at < NOW() - INTERVAL %s HOUR",
+            (CHANGE_FEED_CONFIG['retention_hours'],)
+        )
+
+
+class InMemoryChangeSource(ChangeSource):
+    """In-process change source fed through ``publish``, for tests and replays."""
+
+    def __init__(self):
+        """Initialize the in-memory source."""
+        self._changes: Changes = defaultdict(list)
+        self._condition = threading.Condition()
+        self._stopped = False
+
+    def publish(self, process_number: int, row: Dict[str, Any]):
+        """Deliver a new row to the waiting consumer.
+
+        Args:
+            process_number: Process number the row belongs to
+            row: Process data row
+        """
+        with self._condition:
+            self._changes[process_number].append(row)
+            self._condition.notify_all()
+
+    def start(self):
+        """Allow waiting again after a stop."""
+        with self._condition:
+            self._stopped = False
+
+    def stop(self):
+        """Wake up a pending wait."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def wait_for_changes(self, timeout: float) -> Changes:
+        """Return the published rows, waiting up to ``timeout`` for the first one."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._changes or self._stopped, timeout)
+            changes = dict(self._changes)
+            self._changes.clear()
+        return changes
+
+
+def create_change_source(repository: ProcessRepository, process_numbers: Sequence[int],
+                         source: str = None) -> ChangeSource:
+    """Create the change source selected in CHANGE_FEED_CONFIG.
+
+    Args:
+        repository: Repository used by database-backed sources
+        process_numbers: Processes to deliver rows for
+        source: 'polling' or 'change_log', defaults to the configured source
+
+    Returns:
+        ChangeSource instance
+    """
+    source = source or CHANGE_FEED_CONFIG['source']
+    if source == 'change_log':
+        return ChangeLogSource(repository, process_numbers)
+    if source != 'polling':
+        print(f"Unknown change source '{source}', falling back to polling")
+    return PollingChangeSource(repository, process_numbers)
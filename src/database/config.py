@@ -23,4 +23,42 @@ TABLES = {
     'process_4': 'process4_data',
     'process_5': 'process5_data',
     'process_6': 'process6_data'
-} 
\ No newline at end of file
+}
+
+# Polling settings
+POLLING_CONFIG: Dict[str, Any] = {
+    'mode': os.getenv('DB_POLL_MODE', 'cursor'),  # 'cursor' drains every new row, 'latest' only checks the newest
+    'interval': 1.0,  # Seconds between polls when there is no backlog
+    'batch_size': 200,  # Maximum rows fetched per process per poll in cursor mode
+    'persistent_connection': True  # Poll over a long-lived connection with a prepared statement
+}
+
+# Connection pool sizing: one pooled connection per worker holding a
+# persistent connection (see connection.persistent_workers), plus headroom
+# for short ad-hoc queries
+POOL_CONFIG: Dict[str, Any] = {
+    'headroom': 2,
+    'health_check_interval': 30.0  # Seconds between pings of an idle persistent connection
+}
+
+# Change feed settings
+CHANGE_FEED_CONFIG: Dict[str, Any] = {
+    'source': os.getenv('DB_CHANGE_SOURCE', 'polling'),  # 'polling' or 'change_log'
+    'table': 'process_change_log',  # Trigger-maintained change log table
+    # The change log is re-read every recheck_interval after new entries and
+    # backs off to idle_recheck_interval while nothing arrives. A stopped line
+    # costs 1 / idle_recheck_interval queries per second per station, as with
+    # polling; the first row after a pause can take up to idle_recheck_interval.
+    'recheck_interval': 0.05,
+    'idle_recheck_interval': 1.0,
+    'batch_size': 500,  # Maximum change log entries read at once
+    'retention_hours': 24,  # Change log entries older than this are pruned
+    'install_triggers': False  # Create the change log table and triggers on start
+}
+
+# Local SQLite mirror of the job order material lists
+MATERIAL_MIRROR_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('WMD_MATERIAL_MIRROR', '1') != '0',
+    'path': os.path.join(os.getenv('LOCALAPPDATA', os.path.expanduser('~')), 'WrongMaterialDetector', 'material_lists.sqlite3'),
+    'sync_interval': 30.0  # Seconds between scans of the material list directories
+}
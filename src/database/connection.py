@@ -1,10 +1,24 @@
 """
 Database connection manager.
 """
-import mysql.connector
-from mysql.connector import pooling
-from typing import Optional, Dict, Any
-from .config import DB_CONFIG
+import time
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+from .config import DB_CONFIG, POOL_CONFIG, POLLING_CONFIG, CHANGE_FEED_CONFIG
+
+if TYPE_CHECKING:
+    import mysql.connector
+
+
+def persistent_workers() -> int:
+    """Count the workers that keep a pooled connection checked out.
+    
+    Either the change log reader or, with persistent polling enabled, the
+    batched poller holds a WorkerConnection for its whole lifetime.
+    """
+    if CHANGE_FEED_CONFIG['source'] == 'change_log':
+        return 1
+    return 1 if POLLING_CONFIG['persistent_connection'] else 0
+
 
 class DatabaseConnection:
     """Manages database connections using connection pooling."""
@@ -12,31 +26,45 @@ class DatabaseConnection:
     _instance = None
     _pool = None
     
-    def __new__(cls):
+    def __new__(cls, workers: int = None):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        """Initialize the database connection pool."""
+    def __init__(self, workers: int = None):
+        """Initialize the database connection pool.
+        
+        Args:
+            workers: Number of workers holding a persistent connection, derived
+                from the configured change source if omitted. Only used by the
+                first instance, which creates the pool.
+        """
         if self._pool is None:
+            # Imported on first use so importing the application does not load the driver
+            import mysql.connector
+            from mysql.connector import pooling
+            
+            workers = persistent_workers() if workers is None else workers
+            pool_size = min(workers + POOL_CONFIG['headroom'], pooling.CNX_POOL_MAXSIZE)
             try:
                 self._pool = mysql.connector.pooling.MySQLConnectionPool(
                     pool_name="mypool",
-                    pool_size=5,
+                    pool_size=pool_size,
                     **DB_CONFIG
                 )
-                print("Database connection pool created successfully")
+                print(f"Database connection pool created successfully ({pool_size} connections)")
             except mysql.connector.Error as err:
                 print(f"Error creating connection pool: {err}")
                 raise
     
-    def get_connection(self) -> Optional[mysql.connector.MySQLConnection]:
+    def get_connection(self) -> Optional["mysql.connector.MySQLConnection"]:
         """Get a connection from the pool.
         
         Returns:
             A database connection or None if connection fails
         """
+        import mysql.connector
+        
         try:
             return self._pool.get_connection()
         except mysql.connector.Error as err:
@@ -53,6 +81,8 @@ class DatabaseConnection:
         Returns:
             Query results as a list of dictionaries or None if query fails
         """
+        import mysql.connector
+        
         conn = None
         cursor = None
         try:
@@ -63,7 +93,7 @@ class DatabaseConnection:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(query, params or ())
             
-            if query.strip().upper().startswith('SELECT'):
+            if query.strip().lstrip('(').upper().startswith('SELECT'):
                 return cursor.fetchall()
             else:
                 conn.commit()
@@ -79,4 +109,149 @@ class DatabaseConnection:
             if cursor:
                 cursor.close()
             if conn:
-                conn.close() 
\ No newline at end of file
+                conn.close()
+    
+    def execute_multi(self, query: str, params: tuple = None) -> Optional[List[list]]:
+        """Execute several SELECT statements in a single round-trip.
+        
+        Args:
+            query: Semicolon separated SELECT statements
+            params: Query parameters for all statements, in order
+            
+        Returns:
+            One list of row dictionaries per statement or None if query fails
+        """
+        import mysql.connector
+        
+        conn = None
+        cursor = None
+        try:
+            conn = self.get_connection()
+            if not conn:
+                return None
+                
+            cursor = conn.cursor(dictionary=True)
+            results = []
+            try:
+                statements = cursor.execute(query, params or (), multi=True)
+            except TypeError:
+                # mysql-connector-python 9.2+ dropped multi=True, result sets
+                # are walked with nextset() instead
+                cursor.execute(query, params or ())
+                results.append(cursor.fetchall())
+                while cursor.nextset():
+                    results.append(cursor.fetchall())
+                return results
+                
+            for statement in statements:
+                results.append(statement.fetchall() if statement.with_rows else [])
+            return results
+            
+        except mysql.connector.Error as err:
+            print(f"Error executing multi-statement query: {err}")
+            return None
+            
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
+
+class WorkerConnection:
+    """Long-lived connection owned by a single worker thread.
+    
+    The connection stays checked out of the pool and every statement gets its
+    own prepared cursor, so repeated polls skip pool checkout, session reset
+    and statement parsing. The connection runs in autocommit mode: without it
+    the first SELECT would open a REPEATABLE READ transaction that is never
+    ended, and every later poll would read the same snapshot. The connection is pinged when idle for longer than
+    the health check interval and transparently replaced after an error.
+    """
+    
+    def __init__(self, db: DatabaseConnection, health_check_interval: float = None):
+        """Initialize the worker connection.
+        
+        Args:
+            db: DatabaseConnection whose pool provides the connection
+            health_check_interval: Seconds between liveness pings
+        """
+        self.db = db
+        self.health_check_interval = (POOL_CONFIG['health_check_interval']
+                                      if health_check_interval is None else health_check_interval)
+        self._conn = None
+        self._cursors: Dict[str, Any] = {}
+        self._last_used = 0.0
+        
+    def execute(self, query: str, params: tuple = None) -> Optional[list]:
+        """Execute a SELECT through a prepared statement.
+        
+        Args:
+            query: SQL query to execute, with %s placeholders
+            params: Query parameters
+            
+        Returns:
+            Query results as a list of dictionaries or None if query fails
+        """
+        import mysql.connector
+        
+        for attempt in range(2):
+            try:
+                cursor = self._prepared_cursor(query)
+                cursor.execute(query, params or ())
+                column_names = cursor.column_names
+                rows = [dict(zip(column_names, row)) for row in cursor.fetchall()]
+                self._last_used = time.monotonic()
+                return rows
+            except mysql.connector.Error as err:
+                print(f"Error executing prepared query (attempt {attempt + 1}): {err}")
+                self.close()
+        return None
+        
+    def close(self):
+        """Close the prepared cursors and hand the connection back to the pool."""
+        import mysql.connector
+        
+        for cursor in self._cursors.values():
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                pass
+        self._cursors.clear()
+        if self._conn:
+            try:
+                self._conn.close()
+            except mysql.connector.Error:
+                pass
+        self._conn = None
+        
+    def _prepared_cursor(self, query: str):
+        """Get the prepared cursor for a statement, reconnecting if needed.
+        
+        Args:
+            query: SQL statement the cursor is prepared for
+        """
+        self._ensure_connection()
+        cursor = self._cursors.get(query)
+        if cursor is None:
+            cursor = self._conn.cursor(prepared=True)
+            self._cursors[query] = cursor
+        return cursor
+        
+    def _ensure_connection(self):
+        """Check the connection out of the pool or replace it if it died."""
+        import mysql.connector
+        
+        if self._conn is not None and time.monotonic() - self._last_used > self.health_check_interval:
+            if not self._conn.is_connected():
+                print("Persistent database connection lost, reconnecting")
+                self.close()
+            else:
+                self._last_used = time.monotonic()
+                
+        if self._conn is None:
+            self._conn = self.db.get_connection()
+            if self._conn is None:
+                raise mysql.connector.Error("No connection available from pool")
+            self._conn.autocommit = True
+            self._last_used = time.monotonic()
@@ -0,0 +1,189 @@
+"""
+Local SQLite mirror of the job order material list workbooks.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS material_lists (
+    job_order TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS materials (
+    job_order TEXT NOT NULL,
+    material NOT NULL,
+    PRIMARY KEY (job_order, material)
+) WITHOUT ROWID;
+"""
+
+
+class MaterialMirror:
+    """Mirrors the material list directories into an indexed SQLite file.
+
+    A background thread scans the directories every ``sync_interval``
+    seconds and reparses only the workbooks whose mtime or size changed,
+    so a restart needs no reparsing at all. Lookups are a primary key query
+    on the local file and keep working while the share is unreachable.
+    When a job order exists in several directories, the first directory
+    wins, as with the live lookup.
+    """
+
+    def __init__(self, db_path: str, directories: Callable[[], List[str]],
+                 load: Callable[[str], FrozenSet[Any]], sync_interval: float = 30.0):
+        """Initialize the mirror.
+
+        Args:
+            db_path: SQLite file, created if missing
+            directories: Callable returning the directories to mirror, most preferred first
+            load: Callable reading the materials of a workbook
+            sync_interval: Seconds between directory scans
+        """
+        self.db_path = db_path
+        self.directories = directories
+        self.load = load
+        self.sync_interval = sync_interval
+        self.last_sync: Optional[float] = None
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection; SQLite connections are per thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")  # Readers are not blocked by a sync
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def lookup(self, job_order: str) -> Optional[FrozenSet[Any]]:
+        """Get the mirrored materials of a job order.
+
+        Returns:
+            Frozen set of materials, or None if the job order is not mirrored
+        """
+        connection = self._connection()
+        if connection.execute("SELECT 1 FROM material_lists WHERE job_order = ?", (job_order,)).fetchone() is None:
+            return None
+        rows = connection.execute("SELECT material FROM materials WHERE job_order = ?", (job_order,))
+        return frozenset(row[0] for row in rows)
+
+    def signature(self, job_order: str) -> Optional[Tuple[str, float, int]]:
+        """Get the path, mtime and size a job order was mirrored from.
+
+        Returns:
+            Tuple of path, mtime and size, or None if the job order is not mirrored
+        """
+        row = self._connection().execute(
+            "SELECT path, mtime, size FROM material_lists WHERE job_order = ?", (job_order,)).fetchone()
+        return None if row is None else (row[0], row[1], row[2])
+
+    def sync(self) -> Dict[str, int]:
+        """Bring the mirror up to date with the directories.
+
+        Returns:
+            Counts of updated, removed and failed workbooks
+        """
+        connection = self._connection()
+        known: Dict[str, Tuple[str, float, int]] = {
+            job_order: (path, mtime, size)
+            for job_order, path, mtime, size in connection.execute(
+                "SELECT job_order, path, mtime, size FROM material_lists")
+        }
+        seen = set()
+        scanned = set()
+        interrupted = False
+        counts = {'updated': 0, 'removed': 0, 'failed': 0}
+
+        for directory in self.directories():
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                # Missing year folder or share offline: keep what is mirrored from it
+                continue
+            scanned.add(self._directory_key(directory))
+            for entry in entries:
+                if self._stop.is_set():
+                    interrupted = True
+                    break
+                name = entry.name
+                if not name.lower().endswith('.xlsx') or name.startswith('~$'):
+                    continue
+                job_order = name[:-len('.xlsx')]
+                if job_order in seen:
+                    continue
+                seen.add(job_order)
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if known.get(job_order) == (entry.path, stat.st_mtime, stat.st_size):
+                    continue
+                try:
+                    materials = self.load(entry.path)
+                except Exception as e:
+                    print(f"Error mirroring material list {entry.path}: {e}")
+                    counts['failed'] += 1
+                    continue
+                with connection:
+                    connection.execute("DELETE FROM materials WHERE job_order = ?", (job_order,))
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO materials (job_order, material) VALUES (?, ?)",
+                        [(job_order, material) for material in materials]
+                    )
+                    connection.execute(
+                        "INSERT OR REPLACE INTO material_lists (job_order, path, mtime, size, synced_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (job_order, entry.path, stat.st_mtime, stat.st_size, time.time())
+                    )
+                counts['updated'] += 1
+
+        if not interrupted:
+            # Only drop workbooks whose directory was listed successfully
+            removed = [job_order for job_order, (path, _, _) in known.items()
+                       if job_order not in seen and self._directory_key(os.path.dirname(path)) in scanned]
+            with connection:
+                for job_order in removed:
+                    connection.execute("DELETE FROM materials WHERE job_order = ?", (job_order,))
+                    connection.execute("DELETE FROM material_lists WHERE job_order = ?", (job_order,))
+            counts['removed'] = len(removed)
+        self.last_sync = time.time()
+        return counts
+
+    @staticmethod
+    def _directory_key(directory: str) -> str:
+        """Normalize a directory path for comparison."""
+        return os.path.normcase(os.path.normpath(directory))
+
+    def start(self):
+        """Start syncing in the background."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="material-mirror", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background sync, waiting for a running scan to finish."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        """Sync every interval until stopped."""
+        while not self._stop.is_set():
+            try:
+                counts = self.sync()
+                if counts['updated'] or counts['removed']:
+                    print(f"Material mirror synced: {counts['updated']} updated, {counts['removed']} removed")
+            except Exception as e:
+                print(f"Error syncing material mirror: {e}")
+            self._stop.wait(self.sync_interval)
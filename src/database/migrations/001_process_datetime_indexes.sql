@@ -0,0 +1,12 @@
+-- DateTime indexes used by cursor polling (POLLING_CONFIG['mode'] = 'cursor').
+-- Run once against the production database by an account allowed to alter
+-- the process tables; the detector only checks that they exist.
+--
+--     mysql -h 192.168.2.148 -u <admin> fc_1_data_db < src/database/migrations/001_process_datetime_indexes.sql
+
+CREATE INDEX IF NOT EXISTS `idx_process_1_datetime` ON `process1_data` (`Process_1_DateTime`);
+CREATE INDEX IF NOT EXISTS `idx_process_2_datetime` ON `process2_data` (`Process_2_DateTime`);
+CREATE INDEX IF NOT EXISTS `idx_process_3_datetime` ON `process3_data` (`Process_3_DateTime`);
+CREATE INDEX IF NOT EXISTS `idx_process_4_datetime` ON `process4_data` (`Process_4_DateTime`);
+CREATE INDEX IF NOT EXISTS `idx_process_5_datetime` ON `process5_data` (`Process_5_DateTime`);
+CREATE INDEX IF NOT EXISTS `idx_process_6_datetime` ON `process6_data` (`Process_6_DateTime`);
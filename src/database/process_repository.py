@@ -1,16 +1,214 @@
 """
 Repository for process data operations.
 """
-from typing import Optional, Dict, Any
-from .connection import DatabaseConnection
-from .config import TABLES
+import datetime
+import threading
+from typing import Optional, Dict, Any, Iterable, List, NamedTuple, Sequence
+from .connection import DatabaseConnection, WorkerConnection
+from .config import TABLES, POLLING_CONFIG
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for MariaDB.
+    
+    Args:
+        name: Identifier, which may contain spaces
+        
+    Returns:
+        Backtick-quoted identifier
+    """
+    return "`" + name.replace("`", "``") + "`"
+
+
+# Lowest value of a MariaDB DATETIME column, used as the cursor of an empty table
+MIN_DATETIME = datetime.datetime(1000, 1, 1)
+
+
+class SchemaError(Exception):
+    """A process table lacks something the detector needs to poll it."""
+
+
+class ProcessCursor(NamedTuple):
+    """Position of the last consumed row in a process table.
+    
+    Rows are ordered by (DateTime, key), where key is the table's primary
+    key or another unique column. DATETIME only has 1-second resolution, so
+    the key orders the units written in the same second, and none is lost
+    or repeated. A key of None is before every row at ``datetime``.
+    """
+    datetime: datetime.datetime
+    key: Any
+    
+    def advance(self, rows: List[Dict[str, Any]], datetime_column: str, key_column: str) -> 'ProcessCursor':
+        """Move the cursor past a batch of rows fetched in ascending order.
+        
+        Args:
+            rows: Rows returned for this cursor
+            datetime_column: Name of the process DateTime column
+            key_column: Name of the unique column ordering rows within a second
+            
+        Returns:
+            The cursor positioned after the last row
+        """
+        if not rows:
+            return self
+        return ProcessCursor(rows[-1][datetime_column], rows[-1][key_column])
+
 
 class ProcessRepository:
     """Handles database operations for process data."""
     
-    def __init__(self):
-        """Initialize the process repository."""
+    def __init__(self, columns: Optional[Dict[int, Sequence[str]]] = None,
+                 required_columns: Optional[Dict[int, Sequence[str]]] = None):
+        """Initialize the process repository.
+        
+        Args:
+            columns: Columns to fetch per process number. Processes without an
+                entry are fetched with SELECT *.
+            required_columns: Columns per process number that must exist in
+                the table. The DateTime column is always required.
+        """
         self.db = DatabaseConnection()
+        self.columns = columns or {}
+        self.required_columns = required_columns or {}
+        self._projections: Dict[int, List[str]] = {}
+        self._key_columns: Dict[int, str] = {}
+        self._local = threading.local()
+        
+    def _projected_columns(self, process_number: int) -> Optional[List[str]]:
+        """Get the columns fetched for a process.
+        
+        Optional columns missing from the table are left out (with a warning)
+        so a stale config cannot break the whole batched query. Required
+        columns are always fetched, and never left out.
+        
+        Args:
+            process_number: Process number (1-6)
+            
+        Returns:
+            List of column names, or None to fetch every column
+            
+        Raises:
+            SchemaError: If a required column is missing from the table
+        """
+        if process_number in self._projections:
+            return self._projections[process_number]
+        if process_number not in self.columns:
+            return None
+            
+        table_name = TABLES[f'process_{process_number}']
+        # The required columns come first, so the projection is never empty
+        wanted = self._required(process_number) + list(self.columns[process_number])
+        if process_number in self._key_columns:
+            wanted.append(self._key_columns[process_number])
+        wanted = list(dict.fromkeys(wanted))
+        existing = self._table_columns(table_name)
+        if existing is None:
+            # Could not inspect the table, try again on the next query
+            return wanted
+            
+        missing_required = [column for column in self._required(process_number) if column not in existing]
+        if missing_required:
+            raise SchemaError(f"{table_name} has no column {', '.join(repr(c) for c in missing_required)}")
+        for column in wanted:
+            if column not in existing:
+                print(f"Column '{column}' not found in {table_name}, skipping it")
+        projection = [column for column in wanted if column in existing]
+        self._projections[process_number] = projection
+        return projection
+        
+    def _required(self, process_number: int) -> List[str]:
+        """Get the columns a process table must have."""
+        return list(dict.fromkeys(
+            [f'Process_{process_number}_DateTime'] + list(self.required_columns.get(process_number, ()))
+        ))
+        
+    def check_columns(self, process_number: int) -> bool:
+        """Check that a process table has every column required to poll it.
+        
+        Args:
+            process_number: Process number (1-6)
+            
+        Returns:
+            True once the table has been checked, False if it could not be inspected
+            
+        Raises:
+            SchemaError: If a required column is missing from the table
+        """
+        if process_number not in self.columns:
+            return True
+        self._projected_columns(process_number)
+        return process_number in self._projections
+        
+    def _select_list(self, process_number: int) -> str:
+        """Build the quoted column list fetched for a process.
+        
+        Args:
+            process_number: Process number (1-6)
+            
+        Returns:
+            Comma separated, quoted column list
+        """
+        columns = self._projected_columns(process_number)
+        if columns is None:
+            return "*"
+        return ", ".join(quote_identifier(column) for column in columns)
+        
+    def _table_columns(self, table_name: str) -> Optional[set]:
+        """Get the column names of a table.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Set of column names or None if the query fails
+        """
+        result = self.db.execute_query(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table_name,)
+        )
+        if not result:
+            return None
+        return {row['COLUMN_NAME'] for row in result}
+    
+    def key_column(self, process_number: int) -> Optional[str]:
+        """Get the unique column that orders the rows written in the same second.
+        
+        The primary key is preferred, then any other single-column unique key.
+        
+        Args:
+            process_number: Process number (1-6)
+            
+        Returns:
+            Name of the key column or None if the query fails
+            
+        Raises:
+            SchemaError: If the table has no single-column unique key
+        """
+        if process_number in self._key_columns:
+            return self._key_columns[process_number]
+        table_name = TABLES[f'process_{process_number}']
+        rows = self.db.execute_query(
+            "SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND NON_UNIQUE = 0 "
+            "ORDER BY INDEX_NAME = 'PRIMARY' DESC, INDEX_NAME, SEQ_IN_INDEX",
+            (table_name,)
+        )
+        if rows is None:
+            return None
+        index_columns: Dict[str, List[str]] = {}
+        for row in rows:
+            index_columns.setdefault(row['INDEX_NAME'], []).append(row['COLUMN_NAME'])
+        for columns in index_columns.values():
+            if len(columns) == 1:
+                self._key_columns[process_number] = columns[0]
+                # Recompute the projection so every row carries its key
+                self._projections.pop(process_number, None)
+                return columns[0]
+        raise SchemaError(
+            f"{table_name} has no primary key or single-column unique key, "
+            f"so rows written in the same second cannot be told apart"
+        )
     
     def get_latest_process_data(self, process_number: int) -> Optional[Dict[str, Any]]:
         """Get the latest data for a specific process.
@@ -21,10 +219,10 @@ class ProcessRepository:
         Returns:
             Dictionary containing the latest process data or None if not found
         """
-        table_name = TABLES[f'process_{process_number}']
-        datetime_column = f'Process_{process_number}_DateTime'
+        table_name = quote_identifier(TABLES[f'process_{process_number}'])
+        datetime_column = quote_identifier(f'Process_{process_number}_DateTime')
         query = f"""
-            SELECT *
+            SELECT {self._select_list(process_number)}
             FROM {table_name}
             ORDER BY {datetime_column} DESC
             LIMIT 1
@@ -42,12 +240,221 @@ class ProcessRepository:
         Returns:
             Dictionary containing the process data or None if not found
         """
-        table_name = TABLES[f'process_{process_number}']
-        datetime_column = f'Process_{process_number}_DateTime'
+        table_name = quote_identifier(TABLES[f'process_{process_number}'])
+        datetime_column = quote_identifier(f'Process_{process_number}_DateTime')
         query = f"""
-            SELECT *
+            SELECT {self._select_list(process_number)}
             FROM {table_name}
             WHERE {datetime_column} = %s
         """
         result = self.db.execute_query(query, (datetime_str,))
-        return result[0] if result else None 
\ No newline at end of file
+        return result[0] if result else None
+    
+    def get_latest_process_data_batch(self, process_numbers: Iterable[int] = None) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Get the latest data for several processes in one round-trip.
+        
+        Args:
+            process_numbers: Process numbers to fetch, defaults to every table in TABLES
+            
+        Returns:
+            Dictionary mapping process numbers to their latest row (or None if the
+            table is empty). Empty if the query fails.
+        """
+        if process_numbers is None:
+            process_numbers = [int(key.split('_')[1]) for key in TABLES]
+        process_numbers = list(process_numbers)
+        
+        results = self._fetch_batch(
+            process_numbers,
+            "ORDER BY {datetime_column} DESC LIMIT 1",
+            [() for _ in process_numbers]
+        )
+        if results is None:
+            return {}
+        return {
+            process_number: rows[0] if rows else None
+            for process_number, rows in results.items()
+        }
+    
+    def get_initial_cursors(self, process_numbers: Iterable[int]) -> Optional[Dict[int, ProcessCursor]]:
+        """Get cursors positioned just before the latest row of each process.
+        
+        The first cursor read therefore returns the current row, matching what
+        the latest-row poller would validate on startup. Requires key_column
+        to have been resolved for every process.
+        
+        Args:
+            process_numbers: Process numbers to create cursors for
+            
+        Returns:
+            Dictionary mapping process numbers to cursors or None if the query fails
+        """
+        process_numbers = list(process_numbers)
+        # The second newest row; the cursor sits right after it
+        results = self._fetch_batch(
+            process_numbers,
+            "ORDER BY {datetime_column} DESC, {key_column} DESC LIMIT 1 OFFSET 1",
+            [() for _ in process_numbers]
+        )
+        if results is None:
+            return None
+        cursors = {}
+        for process_number in process_numbers:
+            rows = results.get(process_number)
+            if rows:
+                cursors[process_number] = ProcessCursor(
+                    rows[0][f'Process_{process_number}_DateTime'], rows[0][self._key_columns[process_number]]
+                )
+            else:
+                cursors[process_number] = ProcessCursor(MIN_DATETIME, None)
+        return cursors
+    
+    def get_process_data_since_batch(self, cursors: Dict[int, ProcessCursor], batch_size: int) -> Dict[int, List[Dict[str, Any]]]:
+        """Get the rows written after each cursor, oldest first, in one round-trip.
+        
+        Each statement is a range scan on the DateTime column, so with the
+        index from the DateTime index migration no sort is needed. The key
+        column breaks ties between rows of the same second, so the same
+        rows come back in the same order on every query.
+        
+        Args:
+            cursors: Cursor per process number
+            batch_size: Maximum number of rows returned per process
+            
+        Returns:
+            Dictionary mapping process numbers to lists of new rows. Empty if the query fails.
+        """
+        process_numbers = list(cursors.keys())
+        results = self._fetch_batch(
+            process_numbers,
+            # (DateTime, key) > cursor, spelled out so the DateTime index is used
+            "WHERE {datetime_column} > %s OR ({datetime_column} = %s AND {key_column} > %s) "
+            "ORDER BY {datetime_column} ASC, {key_column} ASC LIMIT %s",
+            [(cursors[n].datetime, cursors[n].datetime, cursors[n].key, batch_size) for n in process_numbers]
+        )
+        if results is None:
+            return {}
+        for process_number, rows in results.items():
+            datetime_column = f'Process_{process_number}_DateTime'
+            key_column = self._key_columns[process_number]
+            # UNION ALL does not preserve the order of its branches
+            rows.sort(key=lambda row: (row[datetime_column], row[key_column]))
+        return results
+    
+    def check_datetime_indexes(self, process_numbers: Iterable[int]) -> Optional[List[int]]:
+        """Warn about process tables missing the DateTime index cursor polling relies on.
+        
+        The indexes are created by src/database/migrations/001_process_datetime_indexes.sql;
+        the detector never changes the schema itself.
+        
+        Args:
+            process_numbers: Process numbers whose tables should be indexed
+            
+        Returns:
+            Process numbers without an index, or None if the check failed
+        """
+        process_numbers = list(process_numbers)
+        table_names = [TABLES[f'process_{n}'] for n in process_numbers]
+        rows = self.db.execute_query(
+            "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND SEQ_IN_INDEX = 1 "
+            f"AND TABLE_NAME IN ({', '.join(['%s'] * len(table_names))})",
+            tuple(table_names)
+        )
+        if rows is None:
+            return None
+        indexed = {(row['TABLE_NAME'], row['COLUMN_NAME']) for row in rows}
+        missing = [n for n, table_name in zip(process_numbers, table_names)
+                   if (table_name, f'Process_{n}_DateTime') not in indexed]
+        for process_number in missing:
+            print(f"Warning: {TABLES[f'process_{process_number}']} has no index on "
+                  f"Process_{process_number}_DateTime, cursor polling will scan the table. "
+                  f"Run src/database/migrations/001_process_datetime_indexes.sql")
+        return missing
+    
+    def _fetch_batch(self, process_numbers: List[int], clause: str, params: List[tuple]) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+        """Run the same query against several process tables in one round-trip.
+        
+        When every process has a column projection the branches are padded to
+        the same width and combined into one UNION ALL statement, which can be
+        prepared once on the persistent worker connection. Otherwise the
+        statements are sent as one multi-statement call.
+        
+        Args:
+            process_numbers: Process numbers to query
+            clause: SQL after the FROM clause; ``{datetime_column}`` and
+                ``{key_column}`` are replaced with the quoted DateTime and key
+                columns of each table
+            params: Query parameters for each process, in process_numbers order
+            
+        Returns:
+            Dictionary mapping process numbers to lists of rows or None if the query fails
+        """
+        flat_params = tuple(value for process_params in params for value in process_params)
+        projections = {n: self._projected_columns(n) for n in process_numbers}
+        
+        if any(columns is None for columns in projections.values()):
+            statements = []
+            for process_number in process_numbers:
+                table_name = quote_identifier(TABLES[f'process_{process_number}'])
+                datetime_column = quote_identifier(f'Process_{process_number}_DateTime')
+                statements.append(
+                    f"SELECT {self._select_list(process_number)} FROM {table_name} "
+                    + clause.format(datetime_column=datetime_column, key_column=self._quoted_key_column(process_number))
+                )
+            results = self.db.execute_multi(";\n".join(statements), flat_params)
+            return None if results is None else dict(zip(process_numbers, results))
+            
+        width = max(len(columns) for columns in projections.values())
+        branches = []
+        for process_number in process_numbers:
+            columns = projections[process_number]
+            table_name = quote_identifier(TABLES[f'process_{process_number}'])
+            datetime_column = quote_identifier(f'Process_{process_number}_DateTime')
+            select_list = [f"{process_number} AS `process_number`"]
+            select_list += [f"{quote_identifier(column)} AS `c{i}`" for i, column in enumerate(columns)]
+            select_list += [f"NULL AS `c{i}`" for i in range(len(columns), width)]
+            branches.append(
+                f"(SELECT {', '.join(select_list)} FROM {table_name} "
+                f"{clause.format(datetime_column=datetime_column, key_column=self._quoted_key_column(process_number))})"
+            )
+            
+        rows = self._execute_poll("\nUNION ALL\n".join(branches), flat_params)
+        if rows is None:
+            return None
+        results = {process_number: [] for process_number in process_numbers}
+        for row in rows:
+            process_number = row['process_number']
+            results[process_number].append({
+                column: row[f'c{i}'] for i, column in enumerate(projections[process_number])
+            })
+        return results
+        
+    def _quoted_key_column(self, process_number: int) -> str:
+        """Quote the key column of a process, if it has been resolved."""
+        key_column = self._key_columns.get(process_number)
+        return quote_identifier(key_column) if key_column else ""
+        
+    def _execute_poll(self, query: str, params: tuple) -> Optional[list]:
+        """Execute a poll statement on this thread's persistent connection.
+        
+        Args:
+            query: SQL query to execute
+            params: Query parameters
+            
+        Returns:
+            Query results as a list of dictionaries or None if query fails
+        """
+        if not POLLING_CONFIG['persistent_connection']:
+            return self.db.execute_query(query, params)
+        worker = getattr(self._local, 'worker', None)
+        if worker is None:
+            worker = self._local.worker = WorkerConnection(self.db)
+        return worker.execute(query, params)
+        
+    def close(self):
+        """Release the persistent connection held by the calling thread."""
+        worker = getattr(self._local, 'worker', None)
+        if worker:
+            worker.close()
+            self._local.worker = None
@@ -1,9 +1,10 @@
 """
 Process model class.
 """
-from typing import List, Dict
-import tkinter as tk
+from typing import List, Dict, Optional
+import time
 from datetime import datetime
+from ..ui.update_queue import UIUpdateQueue, WidgetUpdate, LogAppend, LogEntry
 
 class Process:
     """Represents a single manufacturing process."""
@@ -20,6 +21,8 @@ class Process:
         self.stop_button = None
         self.error_msg = None
         self.log_widget = None
+        # Widget changes are published here and applied by the UI thread
+        self.update_queue: Optional[UIUpdateQueue] = None
         
         # State
         self._has_error = False
@@ -27,24 +30,39 @@ class Process:
         self.is_loading = True
         self._expected_value = None
         self._is_correct = False
+        self._status_text = "Loading"
+        # Epoch seconds of the row that raised the current error, for latency metrics
+        self.error_origin: Optional[float] = None
+    
+    def _update_widget(self, widget: str, **options):
+        """Publish new options for one of the process widgets."""
+        if widget == 'error_msg' and 'text' in options:
+            self._status_text = options['text']
+        if self.update_queue:
+            self.update_queue.publish(WidgetUpdate(self.process_number, widget, tuple(options.items())))
+    
+    def set_error(self, message: str, expected_value: str = None, actual_value: str = None,
+                  origin: Optional[float] = None):
+        """Set error state with message and expected value.
         
-    def set_error(self, message: str, expected_value: str = None, actual_value: str = None):
-        """Set error state with message and expected value."""
+        origin is the epoch time of the row that caused the error, now if omitted.
+        """
         self._has_error = True
+        self.error_origin = time.time() if origin is None else origin
         self._error_message = message
         self._expected_value = expected_value
         self.is_loading = False
         self._is_correct = False
         
-        if self.error_msg:
-            self.error_msg.config(
-                text=f"{message}\nExpected: {expected_value}" if expected_value else message,
-                fg="red"
-            )
-            self.stop_button.config(bg="red")
-            
+        self._update_widget(
+            'error_msg',
+            text=f"{message}\nExpected: {expected_value}" if expected_value else message,
+            fg="red"
+        )
+        self._update_widget('stop_button', bg="red")
+        
         self.log_error(message, expected_value, actual_value)
-            
+    
     def reset_state(self):
         """Reset error state."""
         self._has_error = False
@@ -53,64 +71,49 @@ class Process:
         self.is_loading = True
         self._is_correct = False
         
-        if self.error_msg:
-            self.error_msg.config(text="Loading", fg="black")
-            self.stop_button.config(bg="orange")
-            
+        self._update_widget('error_msg', text="Loading", fg="black")
+        self._update_widget('stop_button', bg="orange")
+    
     def has_error(self) -> bool:
         """Check if process is in error state."""
         return self._has_error
-        
+    
     def get_error_message(self) -> str:
         """Get current error message."""
         return self._error_message
-
+    
     def update_loading_text(self):
         """Update loading text only if in loading state and not in correct state."""
-        if self.is_loading and not self._is_correct and self.error_msg:
-            current_text = self.error_msg.cget("text")
-            if current_text == "Loading...":
-                self.error_msg.config(text="Loading")
+        if self.is_loading and not self._is_correct:
+            if self._status_text == "Loading...":
+                self._update_widget('error_msg', text="Loading")
             else:
-                self.error_msg.config(text=current_text + ".")
-
+                self._update_widget('error_msg', text=self._status_text + ".")
+    
     def log_error(self, message: str, expected_value: str = None, actual_value: str = None):
         """Add error message to log widget."""
-        if self.log_widget:
-            self.log_widget.config(state=tk.NORMAL)
+        if self.update_queue:
             timestamp = datetime.now().strftime("%H:%M:%S")
-            log_entry = f"\n[{timestamp}] {message}"
-            if actual_value:
-                log_entry += f"\n    Actual: {actual_value}"
-            if expected_value:
-                log_entry += f"\n    Expected: {expected_value}"
-            self.log_widget.insert(tk.END, log_entry)
-            self.log_widget.see(tk.END)  # Auto-scroll to bottom
-            self.log_widget.config(state=tk.DISABLED)
-
+            log_entry = LogEntry(timestamp, message, expected_value, actual_value)
+            self.update_queue.publish(LogAppend(self.process_number, log_entry))
+    
     def show_no_material(self):
         """Show no material detected state."""
-        if self.text_label:
-            self.text_label.config(text=f"Process {self.process_number}", fg="black")
-            if self.error_msg:
-                self.error_msg.config(text="No Material Detected", fg="orange")
-            self.log_error("No Material Detected")
-            
+        self._update_widget('text_label', text=f"Process {self.process_number}", fg="black")
+        self._update_widget('error_msg', text="No Material Detected", fg="orange")
+        self.log_error("No Material Detected")
+    
     def show_correct(self):
         """Show correct state temporarily."""
         self._is_correct = True
         self.is_loading = False
-        if self.text_label:
-            self.text_label.config(text=f"Process {self.process_number} Correct", fg="darkgreen")
-            if self.error_msg:
-                self.error_msg.config(text="All Materials Correct", fg="darkgreen")
-            self.log_error("All Materials Correct")
-            
+        self._update_widget('text_label', text=f"Process {self.process_number} Correct", fg="darkgreen")
+        self._update_widget('error_msg', text="All Materials Correct", fg="darkgreen")
+        self.log_error("All Materials Correct")
+    
     def reset_label(self):
         """Reset the process label to default state."""
         self._is_correct = False
         self.is_loading = True
-        if self.text_label:
-            self.text_label.config(text=f"Process {self.process_number}", fg="black")
-            if self.error_msg:
-                self.error_msg.config(text="Loading", fg="black") 
\ No newline at end of file
+        self._update_widget('text_label', text=f"Process {self.process_number}", fg="black")
+        self._update_widget('error_msg', text="Loading", fg="black")
@@ -0,0 +1,109 @@
+"""
+Compiled per-process material validation plans.
+"""
+from typing import Any, Dict, FrozenSet, Mapping, NamedTuple, Optional, Tuple
+from ..config import PROCESS_CONFIGS, SOUND_TITLES, MATERIAL_SOUND_ALIASES
+
+
+class MaterialCheck(NamedTuple):
+    """A single material column to validate."""
+    material: str
+    column: str
+    sound_key: Optional[str]
+    phrase: str
+
+
+class ValidationPlan(NamedTuple):
+    """Immutable validation rules for one process, built once at startup."""
+    process_number: int
+    datetime_column: str
+    repaired_action_column: str
+    model_code_column: str
+    model_codes: FrozenSet[str]
+    checks: Tuple[MaterialCheck, ...]
+
+    @property
+    def required_columns(self) -> Tuple[str, ...]:
+        """Columns without which no row of the process can be validated."""
+        return (self.datetime_column, self.repaired_action_column, self.model_code_column)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Columns a data row needs for validation, in fetch order."""
+        return self.required_columns + tuple(check.column for check in self.checks)
+
+    def first_invalid(self, data: Mapping[str, Any], valid_materials: FrozenSet[str]) -> Optional[MaterialCheck]:
+        """Find the first material in a row that is not in the job order.
+
+        Args:
+            data: Process data row
+            valid_materials: Materials listed for the current job order
+
+        Returns:
+            The failing check, or None if every material is valid
+        """
+        for check in self.checks:
+            if data[check.column] not in valid_materials:
+                return check
+        return None
+
+
+def resolve_sound_key(process_number: int, material: str,
+                      sound_titles: Mapping[str, str] = SOUND_TITLES) -> Optional[str]:
+    """Find the alarm sound for a wrong material.
+
+    Args:
+        process_number: Process number (1-6)
+        material: Material name as used in ``material_checks``
+        sound_titles: Known sound keys
+
+    Returns:
+        Matching key in ``sound_titles`` or None if there is no sound for the material
+    """
+    fragment = MATERIAL_SOUND_ALIASES.get(material, material.replace(' ', ''))
+    wanted = f"Process{process_number}Wrong{fragment}".lower()
+    for sound_key in sound_titles:
+        if sound_key.lower() == wanted:
+            return sound_key
+    return None
+
+
+def alarm_phrase(process_number: int, material: str) -> str:
+    """Build the spoken announcement for a wrong material.
+
+    Args:
+        process_number: Process number (1-6)
+        material: Material name as used in ``material_checks``
+    """
+    return f"Wrong {material} in process {process_number}"
+
+
+def compile_validation_plans(process_configs: Mapping[int, Dict[str, Any]] = PROCESS_CONFIGS,
+                             sound_titles: Mapping[str, str] = SOUND_TITLES) -> Dict[int, ValidationPlan]:
+    """Compile process configurations into validation plans.
+
+    Args:
+        process_configs: Process configurations keyed by process number
+        sound_titles: Known sound keys
+
+    Returns:
+        Dictionary mapping process numbers to ValidationPlan objects
+    """
+    plans = {}
+    for process_number, config in process_configs.items():
+        checks = []
+        for material, column in config['material_checks'].items():
+            sound_key = resolve_sound_key(process_number, material, sound_titles)
+            if sound_key is None:
+                print(f"No alarm sound found for {material} in process {process_number}, it will be spoken")
+            checks.append(MaterialCheck(material, column, sound_key, alarm_phrase(process_number, material)))
+
+        plans[process_number] = ValidationPlan(
+            process_number=process_number,
+            datetime_column=f'Process_{process_number}_DateTime',
+            repaired_action_column=f'Process {process_number} Repaired Action',
+            model_code_column=f'Process {process_number} Model Code',
+            model_codes=frozenset(config['model_codes']),
+            checks=tuple(checks)
+        )
+    return plans
@@ -0,0 +1,94 @@
+"""
+Bounded, virtualized log view for a process.
+"""
+import tkinter as tk
+from collections import deque
+from typing import Iterable
+from .update_queue import LogEntry
+
+class LogView:
+    """Renders a window of a fixed-capacity log into a Text widget.
+
+    Entries are kept in a ring buffer of ``scrollback`` records, so memory
+    stays bounded however long the station runs. The Text widget only ever
+    holds ``visible_entries`` of them, so inserting and scrolling cost the
+    same with ten entries as with ten thousand. The scrollbar is driven by
+    the position in the buffer instead of the widget contents.
+    """
+
+    def __init__(self, text_widget: tk.Text, scrollbar, scrollback: int, visible_entries: int):
+        """Initialize the log view.
+
+        Args:
+            text_widget: Text widget the visible entries are rendered into
+            scrollbar: Scrollbar showing the position within the buffer
+            scrollback: Maximum number of entries kept
+            visible_entries: Number of entries rendered at once
+        """
+        self.text_widget = text_widget
+        self.scrollbar = scrollbar
+        self.visible_entries = visible_entries
+        self.entries = deque(maxlen=scrollback)
+        self.top = 0
+        self.follow = True
+
+        self.scrollbar.config(command=self.yview)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.text_widget.bind(sequence, self._on_mouse_wheel)
+
+    def append(self, entries: Iterable[LogEntry]):
+        """Add entries and redraw the visible window."""
+        count = len(self.entries)
+        for entry in entries:
+            if count == self.entries.maxlen:
+                # The oldest entry falls out of the ring buffer
+                self.top = max(0, self.top - 1)
+            else:
+                count += 1
+            self.entries.append(entry)
+        self._render()
+
+    def yview(self, *args):
+        """Scrollbar command: move the visible window through the buffer."""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.entries))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible_entries
+            self.top += step
+        self._render(scrolled=True)
+
+    def _on_mouse_wheel(self, event):
+        """Scroll the buffer rather than the widget contents."""
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            self.yview('scroll', -1, 'units')
+        else:
+            self.yview('scroll', 1, 'units')
+        return "break"
+
+    def _render(self, scrolled: bool = False):
+        """Draw the current window of entries and update the scrollbar."""
+        last_top = max(0, len(self.entries) - self.visible_entries)
+        if scrolled:
+            self.top = min(max(0, self.top), last_top)
+            self.follow = self.top == last_top
+        elif self.follow:
+            self.top = last_top
+
+        window = [self.entries[i].format()
+                  for i in range(self.top, min(self.top + self.visible_entries, len(self.entries)))]
+        self.text_widget.config(state=tk.NORMAL)
+        self.text_widget.delete('1.0', tk.END)
+        self.text_widget.insert(tk.END, "\n".join(window))
+        if self.follow:
+            self.text_widget.see(tk.END)  # Auto-scroll to bottom
+        self.text_widget.config(state=tk.DISABLED)
+
+        if self.entries:
+            total = len(self.entries)
+            self.scrollbar.set(self.top / total, min(total, self.top + self.visible_entries) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
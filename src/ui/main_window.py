@@ -3,9 +3,13 @@ Main application window.
 """
 import tkinter as tk
 from tkinter import ttk
+from collections import defaultdict
 from typing import Dict, Callable
 from ..models.process import Process
 from ..config import UI_CONFIG
+from ..utils.profiling import PROFILER
+from .update_queue import UIUpdateQueue, WidgetUpdate, LogAppend
+from .log_view import LogView
 
 class MainWindow:
     """Main application window."""
@@ -15,8 +19,12 @@ class MainWindow:
         self.processes = processes
         self.on_stop = on_stop
         self.root = tk.Tk()
+        self.update_queue = UIUpdateQueue()
+        self.log_views: Dict[int, LogView] = {}
         self._setup_window()
         self._create_widgets()
+        for process in self.processes.values():
+            process.update_queue = self.update_queue
         
     def _setup_window(self):
         """Configure the main window."""
@@ -94,18 +102,52 @@ class MainWindow:
             )
             process.log_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
             
-            # Add scrollbar to log
-            scrollbar = ttk.Scrollbar(process.log_widget, command=process.log_widget.yview)
+            # Add scrollbar to log, driven by the position in the log buffer
+            scrollbar = ttk.Scrollbar(process.log_widget)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            process.log_widget.config(yscrollcommand=scrollbar.set)
+            self.log_views[i] = LogView(
+                process.log_widget,
+                scrollbar,
+                UI_CONFIG['log_scrollback'],
+                UI_CONFIG['log_visible_entries']
+            )
         
     def _on_stop_button(self, process: Process):
         """Handle stop button click."""
         process.reset_state()
         
+    def _apply_updates(self):
+        """Apply queued process updates, one config call per changed widget."""
+        widget_options = {}
+        log_entries = defaultdict(list)
+        for update in self.update_queue.drain():
+            if isinstance(update, WidgetUpdate):
+                options = widget_options.setdefault((update.process_number, update.widget), {})
+                options.update(update.options)
+            elif isinstance(update, LogAppend):
+                log_entries[update.process_number].append(update.entry)
+                
+        for (process_number, widget_name), options in widget_options.items():
+            widget = getattr(self.processes[process_number], widget_name, None)
+            if widget:
+                widget.config(**options)
+                
+        for process_number, entries in log_entries.items():
+            log_view = self.log_views.get(process_number)
+            if log_view:
+                log_view.append(entries)
+                
+        self.root.after(UI_CONFIG['frame_interval_ms'], self._apply_updates)
+        
+    def _on_profile_key(self, event=None):
+        """Start a sampled profile capture (F9)."""
+        PROFILER.start_capture()
+        
     def run(self):
         """Start the main event loop."""
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.bind('<F9>', self._on_profile_key)
+        self.root.after(UI_CONFIG['frame_interval_ms'], self._apply_updates)
         self.root.mainloop()
         
     def _on_close(self):
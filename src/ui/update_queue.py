@@ -0,0 +1,68 @@
+"""
+Thread-safe queue of widget updates published by Process objects.
+"""
+import threading
+from collections import deque
+from typing import Any, List, NamedTuple, Optional, Tuple, Union
+
+class WidgetUpdate(NamedTuple):
+    """New configuration options for one process widget."""
+    process_number: int
+    widget: str
+    options: Tuple[Tuple[str, Any], ...]
+
+
+class LogEntry(NamedTuple):
+    """A structured process log entry."""
+    timestamp: str
+    message: str
+    expected_value: Optional[str] = None
+    actual_value: Optional[str] = None
+
+    def format(self) -> str:
+        """Render the entry as log text."""
+        text = f"[{self.timestamp}] {self.message}"
+        if self.actual_value:
+            text += f"\n    Actual: {self.actual_value}"
+        if self.expected_value:
+            text += f"\n    Expected: {self.expected_value}"
+        return text
+
+
+class LogAppend(NamedTuple):
+    """Entry appended to a process log."""
+    process_number: int
+    entry: LogEntry
+
+
+UIUpdate = Union[WidgetUpdate, LogAppend]
+
+
+class UIUpdateQueue:
+    """Collects UI updates from any thread until the Tk thread drains them.
+
+    Publishing never touches Tk, so monitor, timer and PLC threads can
+    change process state safely. The main window drains the queue at a fixed
+    frame rate and merges updates to the same widget into one ``config`` call.
+    """
+
+    def __init__(self):
+        """Initialize the update queue."""
+        self._updates = deque()
+        self._lock = threading.Lock()
+
+    def publish(self, update: UIUpdate):
+        """Queue an update.
+
+        Args:
+            update: WidgetUpdate or LogAppend record
+        """
+        with self._lock:
+            self._updates.append(update)
+
+    def drain(self) -> List[UIUpdate]:
+        """Take every queued update, oldest first."""
+        with self._lock:
+            updates = list(self._updates)
+            self._updates.clear()
+        return updates
@@ -0,0 +1,189 @@
+"""
+Non-blocking alarm scheduling with a single audio worker.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Hashable, NamedTuple, Optional
+from .sound import SoundManager
+from .metrics import ALARM_LATENCY
+
+class AlarmRequest(NamedTuple):
+    """A repeating alarm submitted by a process."""
+    key: Hashable
+    sound_title: Optional[str]
+    phrase: Optional[str]
+    priority: int
+    repeat_interval: float
+    is_active: Callable[[], bool]
+    generation: int
+    origin: Optional[float] = None
+
+
+class AlarmManager:
+    """Plays alarms from a priority queue on one audio worker thread.
+
+    Callers submit or cancel alarms and return immediately. Each key has at
+    most one alarm, so resubmitting replaces the pending one instead of
+    queueing a duplicate. The worker plays the most urgent due alarm (lowest
+    priority value) and repeats it every ``repeat_interval`` seconds while its
+    ``is_active`` callback returns True.
+    """
+
+    def __init__(self, sound_manager: SoundManager, repeat_interval: float = 2.0):
+        """Initialize the alarm manager.
+
+        Args:
+            sound_manager: SoundManager used for playback
+            repeat_interval: Default seconds between the end of an alarm and its repeat
+        """
+        self.sound_manager = sound_manager
+        self.repeat_interval = repeat_interval
+        self.running = False
+        self.playing_key: Optional[Hashable] = None
+        self._requests: Dict[Hashable, AlarmRequest] = {}
+        self._queue = []
+        self._generations = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """Start the audio worker."""
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="alarm-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the audio worker and drop all alarms."""
+        with self._condition:
+            self.running = False
+            self._requests.clear()
+            self._queue.clear()
+            self._condition.notify_all()
+        self.sound_manager.stop_mp3()
+        if self._thread:
+            self._thread.join()
+
+    def submit(self, key: Hashable, sound_title: Optional[str], priority: int = 0,
+               is_active: Callable[[], bool] = None, repeat_interval: float = None,
+               phrase: Optional[str] = None, origin: Optional[float] = None):
+        """Submit an alarm, replacing any alarm already pending for the key.
+
+        Args:
+            key: Identifies the alarm owner, e.g. the process number
+            sound_title: Sound to play, or None to speak ``phrase`` instead
+            priority: Lower values are played first when several alarms are due
+            is_active: Callback returning False once the alarm should stop repeating
+            repeat_interval: Seconds between repeats, defaults to the manager setting
+            phrase: Announcement spoken when there is no sound
+            origin: Epoch time of the event that raised the alarm, for the latency metric
+        """
+        request = AlarmRequest(
+            key=key,
+            sound_title=sound_title,
+            phrase=phrase,
+            priority=priority,
+            repeat_interval=self.repeat_interval if repeat_interval is None else repeat_interval,
+            is_active=is_active or (lambda: True),
+            generation=next(self._generations),
+            origin=origin
+        )
+        with self._condition:
+            self._requests[key] = request
+            heapq.heappush(self._queue, (time.monotonic(), priority, request.generation, key))
+            self._condition.notify_all()
+
+    def cancel(self, key: Hashable):
+        """Cancel the alarm of a key, stopping it if it is playing.
+
+        Args:
+            key: Alarm owner passed to submit
+        """
+        with self._condition:
+            self._requests.pop(key, None)
+            is_playing = self.playing_key == key
+        if is_playing:
+            self.sound_manager.stop_mp3()
+
+    def is_pending(self, key: Hashable) -> bool:
+        """Check whether a key has an alarm queued or playing."""
+        with self._condition:
+            return key in self._requests
+
+    def _next_request(self) -> Optional[AlarmRequest]:
+        """Wait for the most urgent due alarm.
+
+        Returns:
+            The request to play, or None when the manager is stopping
+        """
+        with self._condition:
+            while self.running:
+                # Drop entries of cancelled or replaced alarms
+                while self._queue and self._is_stale(self._queue[0]):
+                    heapq.heappop(self._queue)
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                now = time.monotonic()
+                if self._queue[0][0] > now:
+                    self._condition.wait(self._queue[0][0] - now)
+                    continue
+
+                # Among all due alarms pick the lowest priority value
+                due = []
+                while self._queue and self._queue[0][0] <= now:
+                    entry = heapq.heappop(self._queue)
+                    if not self._is_stale(entry):
+                        due.append(entry)
+                if not due:
+                    continue
+                due.sort(key=lambda entry: (entry[1], entry[0], entry[2]))
+                for entry in due[1:]:
+                    heapq.heappush(self._queue, entry)
+                request = self._requests[due[0][3]]
+                if request.origin is not None:
+                    # Only the first play of an alarm counts towards its latency
+                    self._requests[request.key] = request._replace(origin=None)
+                self.playing_key = request.key
+                return request
+        return None
+
+    def _is_stale(self, entry) -> bool:
+        """Check whether a queue entry belongs to a cancelled or replaced alarm."""
+        request = self._requests.get(entry[3])
+        return request is None or request.generation != entry[2]
+
+    def _run(self):
+        """Play due alarms until stopped."""
+        while self.running:
+            request = self._next_request()
+            if request is None:
+                break
+
+            try:
+                if request.is_active():
+                    if request.origin is not None:
+                        ALARM_LATENCY.observe(time.time() - request.origin, process=request.key)
+                    if request.sound_title:
+                        print(f"Playing sound: {request.sound_title}")
+                        self.sound_manager.play_mp3(request.sound_title)
+                    elif request.phrase:
+                        print(f"Speaking: {request.phrase}")
+                        self.sound_manager.speak_text(request.phrase)
+            except Exception as e:
+                print(f"Error playing alarm {request.sound_title or request.phrase}: {e}")
+
+            with self._condition:
+                self.playing_key = None
+                current = self._requests.get(request.key)
+                if current is None or current.generation != request.generation:
+                    continue
+                if self.running and request.is_active():
+                    heapq.heappush(self._queue, (
+                        time.monotonic() + request.repeat_interval,
+                        request.priority, request.generation, request.key
+                    ))
+                else:
+                    del self._requests[request.key]
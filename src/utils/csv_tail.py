@@ -0,0 +1,114 @@
+"""
+Incremental reader for append-only CSV files.
+"""
+import csv
+import os
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class CsvTailReader:
+    """Reads only the lines appended to a CSV file since the last call.
+
+    The reader remembers the byte offset it stopped at and parses just the
+    new complete lines. On the first read only the header and the last
+    ``bootstrap_bytes`` of the file are scanned. A full re-scan happens only
+    when the file shrinks or its header changes (truncated or rotated).
+    """
+
+    def __init__(self, path: str, encoding: str = 'utf-8', keep_rows: int = 50,
+                 bootstrap_bytes: int = 64 * 1024):
+        """Initialize the tail reader.
+
+        Args:
+            path: Path of the CSV file
+            encoding: Text encoding of the file
+            keep_rows: Number of most recent rows kept in memory
+            bootstrap_bytes: Bytes read from the end of the file on the first scan
+        """
+        self.path = path
+        self.encoding = encoding
+        self.bootstrap_bytes = bootstrap_bytes
+        self.header: Optional[List[str]] = None
+        self.offset = 0
+        self.recent_rows = deque(maxlen=keep_rows)
+        self._header_bytes = b''
+
+    @property
+    def last_row(self) -> Optional[Dict[str, str]]:
+        """The most recently appended row, or None if the file has no rows."""
+        return self.recent_rows[-1] if self.recent_rows else None
+
+    def reset(self):
+        """Forget the current position so the next read starts from scratch."""
+        self.header = None
+        self.offset = 0
+        self.recent_rows.clear()
+        self._header_bytes = b''
+
+    def read_new_rows(self) -> List[Dict[str, str]]:
+        """Parse the rows appended since the previous call.
+
+        Returns:
+            List of new rows as dictionaries keyed by header column
+        """
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self.offset or (size > self.offset and not self._same_header(f)):
+                print(f"{self.path} was truncated or rotated, rescanning")
+                self.reset()
+            if size == self.offset:
+                return []
+            if self.header is None and not self._read_header(f, size):
+                return []
+
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+
+        end = data.rfind(b'\n')
+        if end < 0:
+            # Only a partially written line so far
+            return []
+        self.offset += end + 1
+
+        lines = data[:end + 1].decode(self.encoding).splitlines()
+        rows = [dict(zip(self.header, values)) for values in csv.reader(lines) if values]
+        self.recent_rows.extend(rows)
+        return rows
+
+    def _read_header(self, f, size: int) -> bool:
+        """Read the header line and position the offset near the end of the file.
+
+        Args:
+            f: File object opened in binary mode
+            size: Current file size
+
+        Returns:
+            True if a complete header line was read
+        """
+        f.seek(0)
+        header_line = f.readline()
+        if not header_line.endswith(b'\n'):
+            return False
+        self._header_bytes = header_line
+        self.header = next(csv.reader([header_line.decode(self.encoding).strip('\r\n')]))
+        self.offset = len(header_line)
+
+        start = size - self.bootstrap_bytes
+        if start > self.offset:
+            # Skip straight to the tail and drop the partial first line
+            f.seek(start - 1)
+            f.readline()
+            self.offset = f.tell()
+        return True
+
+    def _same_header(self, f) -> bool:
+        """Check that the file still starts with the header seen before.
+
+        Args:
+            f: File object opened in binary mode
+        """
+        if not self._header_bytes:
+            return True
+        f.seek(0)
+        return f.read(len(self._header_bytes)) == self._header_bytes
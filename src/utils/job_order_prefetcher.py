@@ -0,0 +1,104 @@
+"""
+Background prefetching of upcoming job orders' material lists.
+"""
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from .csv_tail import CsvTailReader
+from .material_cache import file_signature
+
+
+class JobOrderPrefetcher:
+    """Loads material lists into the cache before the line reaches them.
+
+    A background thread stats ``JobOrderSerials.csv`` every ``interval``
+    seconds. When it changed, the new rows are read through the shared tail
+    reader and the material lists of the current job order and of up to
+    ``lookahead`` other job orders not yet marked "Done" are fetched, which
+    loads them into the cache. The first unit of a new job order then finds
+    its list in memory.
+    """
+
+    def __init__(self, reader: CsvTailReader, reader_lock: threading.Lock,
+                 fetch: Callable[[str], Optional[Any]], lookahead: int = 3, interval: float = 2.0):
+        """Initialize the prefetcher.
+
+        Args:
+            reader: Tail reader of JobOrderSerials.csv, shared with the detection path
+            reader_lock: Lock guarding the reader
+            fetch: Callable loading the material list of a job order into the cache
+            lookahead: Number of pending job orders prefetched besides the current one
+            interval: Seconds between checks of the CSV
+        """
+        self.reader = reader
+        self.reader_lock = reader_lock
+        self.fetch = fetch
+        self.lookahead = lookahead
+        self.interval = interval
+        self.prefetched = 0
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the prefetch thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="job-order-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the prefetch thread, waiting for a running load to finish."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def upcoming_job_orders(self, rows: List[Dict[str, str]]) -> List[str]:
+        """Pick the job orders to prefetch from the recent CSV rows.
+
+        Args:
+            rows: Recent rows, oldest first
+
+        Returns:
+            The current (last) job order, then the newest other job orders whose
+            newest row's "Checking" column is not "Done", without duplicates
+        """
+        job_orders = []
+        seen = set()
+        for index, row in enumerate(reversed(rows)):
+            job_order = row.get("Job Order No")
+            if not job_order or job_order in seen:
+                continue
+            # Only the newest row of a job order tells whether it is done
+            seen.add(job_order)
+            if index > 0 and row.get("Checking") == "Done":
+                continue
+            job_orders.append(job_order)
+            if len(job_orders) > self.lookahead:
+                break
+        return job_orders
+
+    def prefetch(self):
+        """Read new CSV rows and load the upcoming material lists."""
+        with self.reader_lock:
+            self.reader.read_new_rows()
+            rows = list(self.reader.recent_rows)
+
+        for job_order in self.upcoming_job_orders(rows):
+            if self._stop.is_set():
+                return
+            try:
+                if self.fetch(job_order) is not None:
+                    self.prefetched += 1
+            except Exception as e:
+                print(f"Error prefetching material list for job order {job_order}: {e}")
+
+    def _run(self):
+        """Prefetch whenever the CSV changes, until stopped."""
+        while not self._stop.is_set():
+            signature = file_signature(self.reader.path)
+            if signature is not None and signature != self._signature:
+                try:
+                    self.prefetch()
+                    self._signature = signature
+                except Exception as e:
+                    print(f"Error reading {self.reader.path} for prefetch: {e}")
+            self._stop.wait(self.interval)
@@ -0,0 +1,225 @@
+"""
+Thread-safe job order and material list lookup.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, NamedTuple, Optional
+from .csv_tail import CsvTailReader
+from .material_cache import MaterialCache, file_signature
+from .path_resolver import PathResolver
+from .job_order_prefetcher import JobOrderPrefetcher
+from .profiling import span
+
+
+class JobOrderMaterials(NamedTuple):
+    """The running job order and its material list."""
+    job_order: str
+    materials: FrozenSet[Any]
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Call ``function``, or wait for the call already running for ``key``.
+
+        Exceptions are raised to every caller sharing the call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(function())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+
+class JobOrderService:
+    """Finds the running job order and its materials, safe to call from any thread.
+
+    The job order is the last row of ``JobOrderSerials.csv``, re-read at most
+    once per ``revalidate_interval``. Material lists come from the material
+    cache, which re-checks the workbook's mtime and size on the share. On a
+    cache miss the optional local mirror saves the parse when its copy has
+    the same mtime and size, and it answers alone only when the share cannot.
+    Concurrent loads of the same job order are merged into one, so six
+    stations starting a new job order cost a single read of the workbook.
+    Results are immutable ``JobOrderMaterials`` tuples.
+    """
+
+    def __init__(self, csv_path: str, candidates: Callable[[str], List[str]],
+                 load: Callable[[str], FrozenSet[Any]], revalidate_interval: float = 5.0,
+                 negative_ttl: float = 30.0, current_negative_ttl: float = 2.0,
+                 encoding: str = 'latin1'):
+        """Initialize the service.
+
+        Args:
+            csv_path: Path of JobOrderSerials.csv
+            candidates: Callable returning the candidate workbook paths of a job order
+            load: Callable reading the materials of a workbook
+            revalidate_interval: Seconds the job order and cached lists are trusted
+            negative_ttl: Seconds a job order without a workbook is not looked up again
+            current_negative_ttl: The same for the running job order, whose
+                workbook is usually being copied to the share right now
+            encoding: Text encoding of the CSV
+        """
+        self.load = load
+        self.revalidate_interval = revalidate_interval
+        self.reader = CsvTailReader(csv_path, encoding=encoding)
+        self.cache = MaterialCache(revalidate_interval)
+        self.resolver = PathResolver(candidates, negative_ttl)
+        self.current_negative_ttl = current_negative_ttl
+        self.mirror = None
+        self.prefetcher: Optional[JobOrderPrefetcher] = None
+        self._reader_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._loads = SingleFlight()
+        self._job_order = ""
+        self._checked_at = None
+        self._current = JobOrderMaterials("", frozenset())
+
+    def current_job_order(self) -> str:
+        """Get the running job order, reading new CSV rows when the last check is stale."""
+        now = time.monotonic()
+        with self._state_lock:
+            if self._job_order and now - self._checked_at < self.revalidate_interval:
+                return self._job_order
+
+        with span("read_job_order_csv"), self._reader_lock:
+            self.reader.read_new_rows()
+            last_row = self.reader.last_row
+        with self._state_lock:
+            self._checked_at = now
+            if last_row:
+                self._job_order = last_row["Job Order No"]
+            return self._job_order
+
+    def resolve_path(self, job_order: str, negative_ttl: Optional[float] = None) -> Optional[str]:
+        """Find the workbook of a job order on the share."""
+        with span("resolve_material_list"):
+            return self.resolver.resolve(job_order, negative_ttl)
+
+    def read_materials(self, path: str) -> FrozenSet[Any]:
+        """Read the materials of a workbook."""
+        with span("read_excel"):
+            return self.load(path)
+
+    def materials_for(self, job_order: str, negative_ttl: Optional[float] = None) -> Optional[FrozenSet[Any]]:
+        """Get the materials of a job order.
+
+        Args:
+            job_order: Job order number
+            negative_ttl: Seconds a missing workbook is trusted, the resolver's default if omitted
+
+        Returns:
+            Frozen set of materials, or None if the job order has no material list
+        """
+        try:
+            materials = self._loads.do(job_order, lambda: self.cache.get(
+                job_order, lambda key: self.resolve_path(key, negative_ttl),
+                lambda path: self._load_materials(job_order, path)
+            ))
+        except Exception as e:
+            if self.mirror is None:
+                raise
+            print(f"Error reading material list for job order {job_order}, using the mirror: {e}")
+            materials = None
+
+        if materials is None and self.mirror is not None:
+            # Share unreachable or workbook gone: fall back to the last mirrored list
+            with span("material_mirror_lookup"):
+                materials = self.mirror.lookup(job_order)
+        return materials
+
+    def _load_materials(self, job_order: str, path: str) -> FrozenSet[Any]:
+        """Load a workbook, reusing the mirrored list if it was taken from the same file state."""
+        if self.mirror is not None:
+            with span("material_mirror_lookup"):
+                mirrored = self.mirror.signature(job_order)
+                if mirrored is not None:
+                    mirrored_path, mtime, size = mirrored
+                    same_path = os.path.normcase(mirrored_path) == os.path.normcase(path)
+                    if same_path and file_signature(path) == (mtime, size):
+                        materials = self.mirror.lookup(job_order)
+                        if materials is not None:
+                            return materials
+        return self.read_materials(path)
+
+    def lookup(self) -> JobOrderMaterials:
+        """Get the running job order and its materials.
+
+        If the list of the job order cannot be found or read, the previous
+        job order and its materials are returned, as the detector always
+        validated against the last list it could read. A missing workbook of
+        the running job order is looked up again after
+        ``current_negative_ttl`` seconds.
+        """
+        job_order = self.current_job_order()
+        try:
+            materials = self.materials_for(job_order, self.current_negative_ttl)
+        except Exception as e:
+            print(f"Error reading material list for job order {job_order}: {e}")
+            materials = None
+
+        with self._state_lock:
+            if materials is not None:
+                self._current = JobOrderMaterials(job_order, materials)
+            elif job_order != self._current.job_order:
+                print(f"No material list for job order {job_order}, "
+                      f"still validating against job order {self._current.job_order or '(none)'}")
+            return self._current
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Get material cache hit/miss counters."""
+        return self.cache.stats()
+
+    def start_prefetcher(self, lookahead: int = 3, interval: float = 2.0) -> JobOrderPrefetcher:
+        """Start loading upcoming job orders' material lists in the background."""
+        if self.prefetcher is None:
+            self.prefetcher = JobOrderPrefetcher(
+                self.reader, self._reader_lock, self.materials_for, lookahead, interval
+            )
+            self.prefetcher.start()
+        return self.prefetcher
+
+    def start_mirror(self, mirror):
+        """Use a MaterialMirror for lookups and start its background sync."""
+        if self.mirror is None:
+            self.mirror = mirror
+            mirror.start()
+        return self.mirror
+
+    def stop_prefetcher(self):
+        """Stop the prefetch thread."""
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+            self.prefetcher = None
+
+    def stop_mirror(self):
+        """Stop the mirror sync and answer lookups from the share again."""
+        mirror, self.mirror = self.mirror, None
+        if mirror is not None:
+            mirror.stop()
+
+    def close(self):
+        """Stop the background threads."""
+        self.stop_prefetcher()
+        self.stop_mirror()
+        self.resolver.close()
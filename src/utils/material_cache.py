@@ -0,0 +1,114 @@
+"""
+Cache for job-order material lists read from the network share.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+FileSignature = Tuple[float, int]
+
+
+def file_signature(path: str) -> Optional[FileSignature]:
+    """Get the (mtime, size) signature of a file.
+
+    Args:
+        path: Path of the file to stat
+
+    Returns:
+        Tuple of modification time and size, or None if the file is missing
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+class CacheEntry(NamedTuple):
+    """A cached material list and the file state it was loaded from."""
+    path: str
+    signature: FileSignature
+    materials: Any
+    checked_at: float
+
+
+class MaterialCache:
+    """Caches material lists keyed by job order number.
+
+    An entry is only reloaded when the mtime or size of its source file
+    changes. The file is stat'ed at most once per ``revalidate_interval``
+    seconds, so lookups for the running job order do no share I/O at all.
+    """
+
+    def __init__(self, revalidate_interval: float = 5.0):
+        """Initialize the material cache.
+
+        Args:
+            revalidate_interval: Seconds an entry is trusted before its file is stat'ed again
+        """
+        self.revalidate_interval = revalidate_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_order: str, resolve_path: Callable[[str], Optional[str]],
+            load: Callable[[str], Any]) -> Optional[Any]:
+        """Get the material list for a job order, loading it on a miss.
+
+        Args:
+            job_order: Job order number
+            resolve_path: Callable returning the material list path for a job order, or None
+            load: Callable reading the material list from a path
+
+        Returns:
+            The cached or freshly loaded material list, or None if no file was found
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(job_order)
+            if entry and now - entry.checked_at < self.revalidate_interval:
+                self.hits += 1
+                return entry.materials
+
+        if entry and file_signature(entry.path) == entry.signature:
+            with self._lock:
+                self._entries[job_order] = entry._replace(checked_at=now)
+                self.hits += 1
+            return entry.materials
+
+        with self._lock:
+            self.misses += 1
+
+        path = resolve_path(job_order)
+        if not path:
+            self.invalidate(job_order)
+            return None
+        signature = file_signature(path)
+        materials = load(path)
+        if signature is not None:
+            with self._lock:
+                self._entries[job_order] = CacheEntry(path, signature, materials, now)
+        return materials
+
+    def invalidate(self, job_order: Optional[str] = None):
+        """Drop one cached job order, or every entry if none is given.
+
+        Args:
+            job_order: Job order number to drop
+        """
+        with self._lock:
+            if job_order is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(job_order, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters.
+
+        Returns:
+            Dictionary with hits, misses and number of cached entries
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
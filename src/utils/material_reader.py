@@ -0,0 +1,102 @@
+"""
+Readers for the Material column of job order material list workbooks.
+"""
+from typing import Any, FrozenSet, Iterable, Iterator, Sequence
+
+MATERIAL_COLUMN = "Material"
+
+
+class MissingColumnError(ValueError):
+    """The requested column is not in the header row of the workbook."""
+
+
+def _normalize(value: Any) -> Any:
+    """Match the values pandas would produce for a cell."""
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store every number as a float
+        return int(value)
+    return value
+
+
+def _column_values(rows: Iterator[Sequence[Any]], column: str, path: str) -> FrozenSet[Any]:
+    """Collect one column of a row iterator whose first non-empty row is the header."""
+    for header in rows:
+        if any(cell not in (None, "") for cell in header):
+            break
+    else:
+        raise MissingColumnError(f"'{column}' column not found in the file: {path}")
+
+    names = [str(cell).strip() if cell is not None else "" for cell in header]
+    if column not in names:
+        raise MissingColumnError(f"'{column}' column not found in the file: {path}")
+    index = names.index(column)
+
+    materials = set()
+    for row in rows:
+        if index < len(row):
+            value = row[index]
+            if value is not None and value != "":
+                materials.add(_normalize(value))
+    return frozenset(materials)
+
+
+def read_material_column_calamine(path: str, column: str = MATERIAL_COLUMN) -> FrozenSet[Any]:
+    """Read one column of the first sheet with python_calamine.
+
+    The sheet is parsed in Rust; only the header row and the requested
+    column are turned into Python objects.
+    """
+    from python_calamine import CalamineWorkbook
+
+    workbook = CalamineWorkbook.from_path(path)
+    try:
+        sheet = workbook.get_sheet_by_index(0)
+        return _column_values(iter(sheet.iter_rows()), column, path)
+    finally:
+        workbook.close()
+
+
+def read_material_column_openpyxl(path: str, column: str = MATERIAL_COLUMN) -> FrozenSet[Any]:
+    """Read one column of the first sheet with openpyxl in streaming read-only mode."""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        return _column_values(rows, column, path)
+    finally:
+        workbook.close()
+
+
+def read_material_column(path: str, column: str = MATERIAL_COLUMN, backends: Iterable[str] = ('calamine', 'openpyxl')) -> FrozenSet[Any]:
+    """Read the non-empty values of a column from the first sheet of a workbook.
+
+    Args:
+        path: Path of the .xlsx file
+        column: Header of the column to read
+        backends: Readers to try in order. One whose library is not installed
+            is skipped; one that fails to parse the workbook falls back to the next.
+
+    Returns:
+        Frozen set of the column values
+
+    Raises:
+        MissingColumnError: If the column is not in the header row
+        ImportError: If no reader is installed
+    """
+    readers = {'calamine': read_material_column_calamine, 'openpyxl': read_material_column_openpyxl}
+    error = None
+    for backend in backends:
+        try:
+            return readers[backend](path, column)
+        except ImportError:
+            continue
+        except MissingColumnError:
+            # Every reader sees the same header
+            raise
+        except Exception as e:
+            print(f"{backend} could not read {path}: {e}")
+            error = e
+    if error is not None:
+        raise error
+    raise ImportError(f"No Excel reader available, tried: {', '.join(backends)}")
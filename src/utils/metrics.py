@@ -0,0 +1,184 @@
+"""
+In-process latency metrics exposed in the Prometheus text format.
+"""
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(label_names: Sequence[str], label_values: Tuple[str, ...], extra: str = "") -> str:
+    """Render a Prometheus label set."""
+    pairs = [f'{name}="{value}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing count per label set."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        """Initialize the counter."""
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        """Increase the count of a label set."""
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        """Render the counter in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Distribution of observed values in fixed buckets per label set."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize the histogram."""
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (last is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = tuple(str(labels[name]) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def render(self) -> List[str]:
+        """Render the histogram in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                bucket_labels = _format_labels(self.label_names, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds the metrics served by the metrics endpoint."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, help_text, label_names)
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram, name, help_text, label_names, buckets)
+
+    def _register(self, metric_class, name, *args):
+        """Return the metric of a name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args)
+            return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Detection path, from the unit being written to process<N>_data to the line reacting
+ROWS_SEEN = REGISTRY.counter(
+    'wmd_rows_seen_total', "Process rows delivered by the change source", ('process',))
+DECISIONS = REGISTRY.counter(
+    'wmd_decisions_total', "Validation decisions by outcome", ('process', 'decision'))
+POLL_DELAY = REGISTRY.histogram(
+    'wmd_poll_delay_seconds', "Row datetime to the row being seen by the change source", ('process',))
+DECISION_DELAY = REGISTRY.histogram(
+    'wmd_decision_delay_seconds', "Row seen to validation decision", ('process',))
+DETECTION_LATENCY = REGISTRY.histogram(
+    'wmd_detection_latency_seconds', "Row datetime to validation decision", ('process',))
+ALARM_LATENCY = REGISTRY.histogram(
+    'wmd_alarm_latency_seconds', "Row datetime to the alarm starting to play", ('process',))
+PLC_LATENCY = REGISTRY.histogram(
+    'wmd_plc_latency_seconds', "Row datetime to the error state being written to the PLC", ('process',))
+
+
+def start_metrics_server(host: str, port: int, registry: MetricsRegistry = REGISTRY):
+    """Serve the registry over HTTP from a daemon thread.
+
+    Args:
+        host: Interface to bind, normally 127.0.0.1
+        port: TCP port to listen on
+        registry: Metrics to serve
+
+    Returns:
+        The running ThreadingHTTPServer; call shutdown() to stop it
+    """
+    # Imported here because http.server is slow to import and only needed once
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Serves the registry on /metrics."""
+
+        def do_GET(self):
+            """Return the metrics text."""
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            """Keep scrapes out of the console."""
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
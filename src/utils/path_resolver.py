@@ -0,0 +1,118 @@
+"""
+Cached resolution of job order material list paths on the network share.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from .metrics import REGISTRY
+
+PATH_RESOLUTION = REGISTRY.histogram(
+    'wmd_material_path_resolution_seconds', "Time to find a material list on the share", ('outcome',),
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+
+class PathResolver:
+    """Finds the first existing candidate path of a job order and remembers it.
+
+    A found path is reused while it still exists, which costs one probe
+    instead of up to four. A job order with no file is remembered for
+    ``negative_ttl`` seconds, so units of an unknown job order do not probe
+    the share at all. On a cold lookup every candidate is probed in
+    parallel; the first existing one in candidate order wins.
+    """
+
+    def __init__(self, candidates: Callable[[str], List[str]], negative_ttl: float = 30.0,
+                 exists: Callable[[str], bool] = os.path.exists):
+        """Initialize the resolver.
+
+        Args:
+            candidates: Callable returning the candidate paths of a job order, most preferred first
+            negative_ttl: Seconds a job order without a file is not probed again
+            exists: Existence check used for probing
+        """
+        self.candidates = candidates
+        self.negative_ttl = negative_ttl
+        self.exists = exists
+        self._found: Dict[str, str] = {}
+        self._missing: Dict[str, float] = {}  # Job order -> time it was last probed
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def resolve(self, job_order: str, negative_ttl: Optional[float] = None) -> Optional[str]:
+        """Get the material list path of a job order.
+
+        Args:
+            job_order: Job order number
+            negative_ttl: Seconds a missing file is trusted for this call,
+                ``self.negative_ttl`` if omitted
+
+        Returns:
+            The path, or None if no candidate exists
+        """
+        started = time.perf_counter()
+        now = time.monotonic()
+        if negative_ttl is None:
+            negative_ttl = self.negative_ttl
+        with self._lock:
+            path = self._found.get(job_order)
+            missing_since = self._missing.get(job_order)
+
+        if path is not None:
+            if self.exists(path):
+                PATH_RESOLUTION.observe(time.perf_counter() - started, outcome='cached')
+                return path
+            with self._lock:
+                self._found.pop(job_order, None)
+        elif missing_since is not None and now - missing_since < negative_ttl:
+            PATH_RESOLUTION.observe(time.perf_counter() - started, outcome='cached_missing')
+            return None
+
+        candidates = self.candidates(job_order)
+        path = self._probe(candidates)
+        with self._lock:
+            if path is None:
+                self._missing[job_order] = now
+            else:
+                self._found[job_order] = path
+                self._missing.pop(job_order, None)
+        PATH_RESOLUTION.observe(time.perf_counter() - started, outcome='found' if path else 'not_found')
+        if path is None:
+            print(f"File not found: {', '.join(candidates)}")
+        return path
+
+    def invalidate(self, job_order: Optional[str] = None):
+        """Forget the resolution of one job order, or of all if none is given."""
+        with self._lock:
+            if job_order is None:
+                self._found.clear()
+                self._missing.clear()
+            else:
+                self._found.pop(job_order, None)
+                self._missing.pop(job_order, None)
+
+    def close(self):
+        """Shut down the probe threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+    def _probe(self, candidates: List[str]) -> Optional[str]:
+        """Probe all candidates in parallel and return the first existing one in order."""
+        if len(candidates) <= 1:
+            return next((path for path in candidates if self.exists(path)), None)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="path-probe")
+            executor = self._executor
+        futures = [executor.submit(self.exists, path) for path in candidates]
+        # Wait only for the candidates ranked above the winner
+        for path, future in zip(candidates, futures):
+            try:
+                if future.result():
+                    return path
+            except OSError:
+                continue
+        return None
@@ -0,0 +1,152 @@
+"""
+Cache of pre-rendered text-to-speech phrases.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    import pygame
+
+class PhraseCache:
+    """Renders spoken phrases to WAV files once and keeps them decoded in memory.
+
+    Phrases are keyed by text and speech rate. Rendering runs on a single
+    background thread because pyttsx3 engines are not thread-safe. The cache
+    holds at most ``capacity`` phrases and evicts the least recently used
+    one, deleting its file. Files rendered by a previous run are reused.
+    """
+
+    def __init__(self, cache_path: str, capacity: int = 128):
+        """Initialize the phrase cache.
+
+        Args:
+            cache_path: Directory the rendered WAV files are stored in
+            capacity: Maximum number of cached phrases
+        """
+        self.cache_path = cache_path
+        self.capacity = capacity
+        self._sounds: "OrderedDict[str, pygame.mixer.Sound]" = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-render")
+        self._engine = None
+        os.makedirs(self.cache_path, exist_ok=True)
+
+    @staticmethod
+    def phrase_key(text: str, rate: int) -> str:
+        """Get the cache key of a phrase.
+
+        Args:
+            text: Text to speak
+            rate: Speech rate
+        """
+        return hashlib.sha1(f"{rate}|{text}".encode('utf-8')).hexdigest()
+
+    def get(self, text: str, rate: int) -> Optional["pygame.mixer.Sound"]:
+        """Get a rendered phrase without rendering it.
+
+        Args:
+            text: Text to speak
+            rate: Speech rate
+
+        Returns:
+            The decoded phrase or None if it is not cached
+        """
+        key = self.phrase_key(text, rate)
+        with self._lock:
+            sound = self._sounds.get(key)
+            if sound is not None:
+                self._sounds.move_to_end(key)
+            return sound
+
+    def render_async(self, text: str, rate: int) -> Future:
+        """Render a phrase in the background unless it is cached or already queued.
+
+        Args:
+            text: Text to speak
+            rate: Speech rate
+
+        Returns:
+            Future resolving to the decoded phrase, or None if rendering failed
+        """
+        key = self.phrase_key(text, rate)
+        with self._lock:
+            if key in self._sounds:
+                future = Future()
+                future.set_result(self._sounds[key])
+                return future
+            if key not in self._pending:
+                self._pending[key] = self._executor.submit(self._render, text, rate, key)
+            return self._pending[key]
+
+    def get_or_render(self, text: str, rate: int, timeout: float = None) -> Optional["pygame.mixer.Sound"]:
+        """Get a phrase, rendering it first if needed.
+
+        Args:
+            text: Text to speak
+            rate: Speech rate
+            timeout: Maximum seconds to wait for rendering
+
+        Returns:
+            The decoded phrase or None if rendering failed
+        """
+        sound = self.get(text, rate)
+        if sound is not None:
+            return sound
+        return self.render_async(text, rate).result(timeout)
+
+    def prewarm(self, phrases: Iterable[str], rate: int):
+        """Queue a vocabulary of phrases for background rendering.
+
+        Args:
+            phrases: Texts to render
+            rate: Speech rate
+        """
+        for text in phrases:
+            self.render_async(text, rate)
+
+    def close(self):
+        """Stop the rendering thread after queued phrases are done."""
+        self._executor.shutdown(wait=True)
+
+    def _render(self, text: str, rate: int, key: str) -> Optional["pygame.mixer.Sound"]:
+        """Synthesize a phrase to disk (if not there yet) and decode it."""
+        import pygame
+
+        path = os.path.join(self.cache_path, f"{key}.wav")
+        try:
+            if not os.path.exists(path):
+                if self._engine is None:
+                    # Imported on the render thread so startup does not wait for it
+                    import pyttsx3
+                    self._engine = pyttsx3.init()
+                temp_path = os.path.join(self.cache_path, f"{key}.part.wav")
+                self._engine.setProperty('rate', rate)
+                self._engine.save_to_file(text, temp_path)
+                self._engine.runAndWait()
+                os.replace(temp_path, path)
+            sound = pygame.mixer.Sound(path)
+        except Exception as e:
+            print(f"Could not render phrase '{text}': {e}")
+            sound = None
+
+        with self._lock:
+            self._pending.pop(key, None)
+            if sound is not None:
+                self._sounds[key] = sound
+                self._sounds.move_to_end(key)
+                self._evict()
+        return sound
+
+    def _evict(self):
+        """Drop least recently used phrases beyond capacity. Caller holds the lock."""
+        while len(self._sounds) > self.capacity:
+            key, _ = self._sounds.popitem(last=False)
+            try:
+                os.remove(os.path.join(self.cache_path, f"{key}.wav"))
+            except OSError:
+                pass
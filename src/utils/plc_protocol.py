@@ -0,0 +1,72 @@
+"""
+Binary frame protocol for reporting per-process error states to the PLC.
+
+Frame layout (all fields unsigned bytes)::
+
+    0xAA 0x55 | length | mask[0] .. mask[n-1] | sequence | checksum
+
+``length`` is the number of mask bytes ``n``. Bit ``k`` of the mask
+(little-endian across mask bytes) is set when process ``k + 1`` is in
+error. ``sequence`` increments with every frame and wraps at 256.
+``checksum`` is the XOR of every byte from ``length`` to ``sequence``.
+"""
+from typing import Dict, Iterable, NamedTuple, Optional
+
+FRAME_HEADER = b'\xAA\x55'
+
+
+class StatusFrame(NamedTuple):
+    """A decoded status frame."""
+    mask: int
+    sequence: int
+
+
+def mask_size(process_numbers: Iterable[int]) -> int:
+    """Number of mask bytes needed to hold one bit per process."""
+    return (max(process_numbers, default=0) + 7) // 8 or 1
+
+
+def error_mask(error_states: Dict[int, bool]) -> int:
+    """Build the error bitmask from a process number -> has error mapping."""
+    mask = 0
+    for process_num, has_error in error_states.items():
+        if has_error:
+            mask |= 1 << (process_num - 1)
+    return mask
+
+
+def checksum(data: bytes) -> int:
+    """XOR checksum of a frame body."""
+    value = 0
+    for byte in data:
+        value ^= byte
+    return value
+
+
+def encode_frame(mask: int, sequence: int, size: int) -> bytes:
+    """Encode a status frame.
+
+    Args:
+        mask: Error bitmask, bit k set for process k + 1
+        sequence: Frame sequence number, taken modulo 256
+        size: Number of mask bytes
+    """
+    body = bytes([size]) + mask.to_bytes(size, 'little') + bytes([sequence & 0xFF])
+    return FRAME_HEADER + body + bytes([checksum(body)])
+
+
+def decode_frame(frame: bytes) -> Optional[StatusFrame]:
+    """Decode a status frame.
+
+    Returns:
+        The decoded frame, or None if the header, length or checksum is wrong
+    """
+    if len(frame) < 5 or not frame.startswith(FRAME_HEADER):
+        return None
+    size = frame[2]
+    if len(frame) != size + 5:
+        return None
+    body = frame[2:-1]
+    if checksum(body) != frame[-1]:
+        return None
+    return StatusFrame(int.from_bytes(frame[3:3 + size], 'little'), frame[3 + size])
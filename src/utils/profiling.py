@@ -0,0 +1,238 @@
+"""
+Lightweight timing spans and sampled cProfile captures.
+
+Spans are off by default and then cost one global lookup per ``with span()``
+block. When enabled, each span is timed into the ``wmd_span_seconds``
+histogram and a per-span total that ``dump_spans`` writes to a file.
+"""
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from .metrics import REGISTRY
+from ..config import PROFILING_CONFIG
+
+SPAN_SECONDS = REGISTRY.histogram(
+    'wmd_span_seconds', "Time spent in each profiled stage", ('span',),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+
+class _NullSpan:
+    """Context manager that does nothing, shared by every disabled span."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_enabled = PROFILING_CONFIG['spans']
+_totals: Dict[str, List[float]] = {}
+_totals_lock = threading.Lock()
+
+
+class _Span:
+    """Times one block into the span statistics."""
+
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed = time.perf_counter() - self.started
+        SPAN_SECONDS.observe(elapsed, span=self.name)
+        with _totals_lock:
+            totals = _totals.get(self.name)
+            if totals is None:
+                totals = _totals[self.name] = [0, 0.0, 0.0]
+            totals[0] += 1
+            totals[1] += elapsed
+            totals[2] = max(totals[2], elapsed)
+        return False
+
+
+def span(name: str):
+    """Time a block of code when spans are enabled.
+
+    Usage::
+
+        with span('job_order_lookup'):
+            ...
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def set_spans_enabled(enabled: bool):
+    """Turn span timing on or off at runtime."""
+    global _enabled
+    _enabled = enabled
+
+
+def spans_enabled() -> bool:
+    """Check if span timing is on."""
+    return _enabled
+
+
+def dump_spans(path: str):
+    """Write count, total, mean and max time of every span to a text file."""
+    with _totals_lock:
+        totals = sorted(_totals.items(), key=lambda item: item[1][1], reverse=True)
+    with open(path, 'w') as file:
+        file.write(f"{'span':<32}{'count':>10}{'total s':>12}{'mean ms':>12}{'max ms':>12}\n")
+        for name, (count, total, longest) in totals:
+            file.write(f"{name:<32}{count:>10}{total:>12.3f}{1000 * total / count:>12.3f}{1000 * longest:>12.3f}\n")
+
+
+class SamplingProfiler:
+    """Runs cProfile on a random sample of calls during a capture window.
+
+    cProfile only follows the thread that enables it, so each sampled call
+    gets its own profiler and the results are merged. Since Python 3.12 only
+    one profiler can be active per interpreter, so one sampled call runs at
+    a time; calls sampled while it runs are only timed. When the window ends
+    the merged stats are written as a ``.prof`` file (open with pstats or
+    snakeviz) next to a span summary.
+    """
+
+    def __init__(self, output_dir: str, sample_rate: float, duration: float):
+        """Initialize the profiler.
+
+        Args:
+            output_dir: Directory receiving the capture files
+            sample_rate: Fraction of calls profiled during a capture
+            duration: Default capture length in seconds
+        """
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.duration = duration
+        self._deadline: Optional[float] = None
+        self._stats = None  # pstats.Stats merged from the sampled calls
+        self._spans_were_enabled = False
+        self._lock = threading.Lock()
+        self._active = threading.Lock()  # Held by the call being profiled
+        self._timer = None
+
+    @property
+    def capturing(self) -> bool:
+        """Check if a capture window is open."""
+        return self._deadline is not None
+
+    def start_capture(self, duration: float = None):
+        """Open a capture window, ignored if one is already open.
+
+        Args:
+            duration: Capture length in seconds, defaults to the configured duration
+        """
+        duration = duration or self.duration
+        with self._lock:
+            if self._deadline is not None:
+                return
+            self._deadline = time.monotonic() + duration
+            self._stats = None
+            self._spans_were_enabled = spans_enabled()
+        set_spans_enabled(True)
+        self._timer = threading.Timer(duration, self.finish_capture)
+        self._timer.daemon = True
+        self._timer.start()
+        print(f"Profiling {self.sample_rate:.0%} of calls for {duration:.0f}s")
+
+    def finish_capture(self) -> Optional[str]:
+        """Close the capture window and write its results.
+
+        Returns:
+            Path of the written .prof file, or None if nothing was sampled
+        """
+        with self._lock:
+            if self._deadline is None:
+                return None
+            self._deadline = None
+            stats, self._stats = self._stats, None
+        if self._timer:
+            self._timer.cancel()
+        if not self._spans_were_enabled:
+            set_spans_enabled(False)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, time.strftime("profile-%Y%m%d-%H%M%S"))
+        dump_spans(base + "-spans.txt")
+        if stats is None:
+            print(f"Profile capture finished without samples, spans written to {base}-spans.txt")
+            return None
+        stats.dump_stats(base + ".prof")
+        print(f"Profile written to {base}.prof")
+        return base + ".prof"
+
+    def profile(self, name: str):
+        """Time a block as a span and, if sampled during a capture, profile it."""
+        if self._deadline is None or random.random() >= self.sample_rate:
+            return span(name)
+        if not self._active.acquire(blocking=False):
+            return span(name)
+        try:
+            return _ProfiledSpan(self, name)
+        except Exception as e:
+            self._active.release()
+            print(f"Could not profile {name}: {e}")
+            return span(name)
+
+    def _merge(self, profiler):
+        """Add the results of one sampled call."""
+        with self._lock:
+            if self._deadline is None:
+                return
+            if self._stats is None:
+                import pstats
+                self._stats = pstats.Stats(profiler)
+            else:
+                self._stats.add(profiler)
+
+
+class _ProfiledSpan(_Span):
+    """Span that also runs cProfile for the duration of the block."""
+
+    __slots__ = ('profiler', 'owner')
+
+    def __init__(self, owner: SamplingProfiler, name: str):
+        super().__init__(name)
+        self.owner = owner
+        # Only imported once a capture samples a call
+        import cProfile
+        self.profiler = cProfile.Profile()
+
+    def __enter__(self):
+        try:
+            self.profiler.enable()
+        except ValueError as e:
+            # Another profiler is active outside this SamplingProfiler
+            print(f"Could not profile {self.name}: {e}")
+            self.profiler = None
+            self.owner._active.release()
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc, traceback):
+        result = super().__exit__(exc_type, exc, traceback)
+        if self.profiler is not None:
+            try:
+                self.profiler.disable()
+                self.owner._merge(self.profiler)
+            finally:
+                self.owner._active.release()
+        return result
+
+
+PROFILER = SamplingProfiler(
+    PROFILING_CONFIG['output_dir'],
+    PROFILING_CONFIG['sample_rate'],
+    PROFILING_CONFIG['capture_seconds']
+)
@@ -0,0 +1,277 @@
+"""
+Record production traffic and replay it through the process controller.
+
+A recording is a gzip file of JSON lines, one event per line::
+
+    {"t": 12.5, "type": "materials", "job_order": "JO-123", "materials": [...]}
+    {"t": 12.5, "type": "row", "process": 3, "row": {...}}
+
+Rows are recorded in the order the controller validated them. A
+``materials`` event precedes the first row validated against a new job
+order or material list, so replaying the events in order reproduces the
+lookup each row saw. ``t`` is seconds since the recording started. Datetime values are stored as
+``{"$dt": "<isoformat>"}`` so replayed rows keep their original types.
+"""
+import datetime
+import decimal
+import gzip
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+from .job_order_service import JobOrderMaterials
+
+
+def _encode_value(value: Any) -> Any:
+    """Convert a row value to JSON."""
+    if isinstance(value, datetime.datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, (datetime.date, datetime.time, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """Convert a JSON value back to a row value."""
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.datetime.fromisoformat(value["$dt"])
+    return value
+
+
+class Recorder:
+    """Appends timestamped events to a gzip JSON lines file from any thread."""
+
+    def __init__(self, path: str):
+        """Open the recording file.
+
+        Args:
+            path: File to write, replaced if it exists
+        """
+        self.path = path
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._materials: Optional[JobOrderMaterials] = None
+
+    def _line(self, event_type: str, t: Optional[float] = None, **fields) -> str:
+        """Serialize one event, stamped now unless ``t`` is given."""
+        if t is None:
+            t = round(time.monotonic() - self._started, 6)
+        event = {"t": t, "type": event_type, **fields}
+        return json.dumps(event, separators=(',', ':'), default=str) + "\n"
+
+    def record(self, event_type: str, **fields):
+        """Write one event."""
+        line = self._line(event_type, **fields)
+        with self._lock:
+            if self._file:
+                self._file.write(line)
+
+    def record_row(self, process_number: int, row: Dict[str, Any],
+                   job_order: Optional[JobOrderMaterials] = None):
+        """Write a process row event.
+
+        Args:
+            process_number: Process number the row belongs to
+            row: Process data row
+            job_order: Lookup result the row was validated against, if any. A
+                materials event is written first when it differs from the
+                last recorded one.
+        """
+        t = round(time.monotonic() - self._started, 6)
+        row_line = self._line("row", t, process=process_number,
+                              row={key: _encode_value(value) for key, value in row.items()})
+        with self._lock:
+            if not self._file:
+                return
+            if job_order is not None and job_order is not self._materials and job_order != self._materials:
+                self._materials = job_order
+                self._file.write(self._line("materials", t, job_order=job_order.job_order,
+                                            materials=sorted(str(material) for material in job_order.materials)))
+            self._file.write(row_line)
+
+    def close(self):
+        """Flush and close the recording file."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class RecordingJobOrders:
+    """Job order lookup wrapper remembering the result each thread last got."""
+
+    def __init__(self, job_orders: Any):
+        """Initialize the wrapper.
+
+        Args:
+            job_orders: Job order lookup to delegate to, e.g. the JobOrderManager service
+        """
+        self.job_orders = job_orders
+        self._local = threading.local()
+
+    def lookup(self) -> JobOrderMaterials:
+        """Delegate to the wrapped lookup and remember the result."""
+        result = self._local.result = self.job_orders.lookup()
+        return result
+
+    def take(self) -> Optional[JobOrderMaterials]:
+        """Return and forget the calling thread's last lookup result."""
+        result = getattr(self._local, 'result', None)
+        self._local.result = None
+        return result
+
+
+def attach_recorder(controller, recorder: Recorder) -> RecordingJobOrders:
+    """Record every row the controller validates, with the lookup it used.
+
+    Rows are written after validation from the thread that validated them,
+    so each row follows the material list it was checked against.
+
+    Args:
+        controller: ProcessController to record
+        recorder: Recorder receiving the events
+
+    Returns:
+        The lookup wrapper installed on the controller
+    """
+    job_orders = RecordingJobOrders(controller.job_orders)
+    controller.job_orders = job_orders
+    handle_data_change = controller._handle_data_change
+
+    def recording_handle_data_change(process, data, seen_at=None):
+        job_orders.take()
+        try:
+            handle_data_change(process, data, seen_at)
+        finally:
+            recorder.record_row(process.process_number, data, job_orders.take())
+
+    controller._handle_data_change = recording_handle_data_change
+    return job_orders
+
+
+class ReplayJobOrders:
+    """Job order lookup serving the material lists of a recording."""
+
+    def __init__(self):
+        """Initialize with no job order."""
+        self.read_job_order = ""
+        self.job_order_materials = frozenset()
+
+    def lookup(self) -> JobOrderMaterials:
+        """Return the job order and materials of the replay position.
+
+        They are set by the replayer as events are reached.
+        """
+        return JobOrderMaterials(self.read_job_order, self.job_order_materials)
+
+
+def read_recording(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the events of a recording in order."""
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ReplayReport(NamedTuple):
+    """Outcome of a replay."""
+    rows: int
+    elapsed: float
+    handle_time: float
+    decisions: Dict[int, Counter]
+
+    @property
+    def throughput(self) -> float:
+        """Rows validated per second of wall time."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def format(self) -> str:
+        """Render the report as text."""
+        lines = [
+            f"Rows replayed: {self.rows}",
+            f"Elapsed: {self.elapsed:.3f}s ({self.throughput:.1f} rows/s)",
+            f"Mean validation time: {1000 * self.handle_time / self.rows if self.rows else 0.0:.3f} ms",
+        ]
+        for process_number in sorted(self.decisions):
+            counts = ", ".join(f"{decision}={count}" for decision, count in sorted(self.decisions[process_number].items()))
+            lines.append(f"Process {process_number}: {counts}")
+        return "\n".join(lines)
+
+
+class Replayer:
+    """Feeds a recording through ``ProcessController._handle_data_change``.
+
+    The controller should be built with a ``ReplayJobOrders`` lookup. Its
+    ``_play_error_sound``, ``_show_correct_temporary`` and each process'
+    ``show_no_material`` are replaced so the replay plays no audio and
+    starts no timers, and ``_observe_decision`` is wrapped to record the
+    decision of each row.
+    """
+
+    def __init__(self, controller, job_orders: ReplayJobOrders, speed: Optional[float] = None):
+        """Initialize the replayer.
+
+        Args:
+            controller: ProcessController whose validation is exercised
+            job_orders: Lookup the controller was built with
+            speed: Playback speed relative to the recording, None for as fast as possible
+        """
+        self.controller = controller
+        self.job_orders = job_orders
+        self.speed = speed
+        self.decisions: Dict[int, Counter] = defaultdict(Counter)
+        self._decision = None
+        controller._play_error_sound = self._on_alarm
+        controller._show_correct_temporary = self._on_correct
+        controller._observe_decision = self._on_decision(controller._observe_decision)
+
+    def _on_alarm(self, process, sound_title, phrase=None):
+        """Skip the alarm sound."""
+
+    def _on_correct(self, process):
+        """Skip the temporary correct display."""
+
+    def _on_decision(self, observe_decision):
+        """Wrap ProcessController._observe_decision to record the decision."""
+        def wrapper(process, data, seen_at, decision):
+            self._decision = decision
+            observe_decision(process, data, seen_at, decision)
+        return wrapper
+
+    def replay(self, path: str) -> ReplayReport:
+        """Replay a recording file.
+
+        Args:
+            path: Recording written by Recorder
+
+        Returns:
+            Row count, timings and the decisions per process
+        """
+        rows = 0
+        handle_time = 0.0
+        started = time.perf_counter()
+        for event in read_recording(path):
+            if self.speed:
+                delay = event["t"] / self.speed - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+            if event["type"] == "materials":
+                self.job_orders.read_job_order = event["job_order"]
+                self.job_orders.job_order_materials = frozenset(event["materials"])
+            elif event["type"] == "row":
+                process = self.controller.processes.get(event["process"])
+                if process is None:
+                    continue
+                row = {key: _decode_value(value) for key, value in event["row"].items()}
+                self._decision = None
+                handle_started = time.perf_counter()
+                self.controller._handle_data_change(process, row)
+                handle_time += time.perf_counter() - handle_started
+                rows += 1
+                self.decisions[process.process_number][self._decision or "skipped"] += 1
+        return ReplayReport(rows, time.perf_counter() - started, handle_time, dict(self.decisions))
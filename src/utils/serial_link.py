@@ -0,0 +1,161 @@
+"""
+Reconnecting, line-framed serial link.
+"""
+import threading
+from typing import Callable
+
+class SerialLink:
+    """Owns a serial port, reads lines from it and reopens it when it fails.
+
+    The port is opened with ``serial.serial_for_url``, so plain port names
+    (``COM7``) and pyserial URLs (``loop://``, ``socket://host:port``) both
+    work. A reader thread opens the port, frames incoming bytes into lines for
+    ``on_line`` and, after any ``SerialException``, retries with a doubling
+    delay between ``reconnect_min`` and ``reconnect_max`` seconds.
+    """
+
+    def __init__(self, url: str, baudrate: int, on_line: Callable[[str], None] = None,
+                 on_connect: Callable[[], None] = None, read_timeout: float = 0.5,
+                 reconnect_min: float = 0.5, reconnect_max: float = 30.0):
+        """Initialize the serial link.
+
+        Args:
+            url: Port name or pyserial URL
+            baudrate: Serial communication baudrate
+            on_line: Called from the reader thread with every received line
+            on_connect: Called when the port has been (re)opened, before it is used
+            read_timeout: Seconds a read waits before checking for shutdown
+            reconnect_min: First delay before reopening a lost port
+            reconnect_max: Upper bound of the reconnect delay
+        """
+        self.url = url
+        self.baudrate = baudrate
+        self.on_line = on_line
+        self.on_connect = on_connect
+        self.read_timeout = read_timeout
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.running = False
+        self.serial = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def connected(self) -> bool:
+        """Check if the port is currently open."""
+        port = self.serial
+        return port is not None and port.is_open
+
+    def start(self):
+        """Start the reader thread, which opens the port."""
+        self.running = True
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="serial-link", daemon=True)
+        self._thread.start()
+
+    def stop(self, final_write: bytes = None):
+        """Stop the reader thread and close the port.
+
+        Args:
+            final_write: Bytes written just before the port is closed
+        """
+        self.running = False
+        self._stopped.set()
+        if final_write is not None:
+            self.write(final_write)
+        self._close()
+        if self._thread:
+            self._thread.join()
+
+    def write(self, data: bytes) -> bool:
+        """Write bytes to the port.
+
+        Returns:
+            True if the bytes were written, False if the port is not open
+        """
+        import serial
+
+        with self._lock:
+            port = self.serial
+            if port is None or not port.is_open:
+                return False
+            try:
+                port.write(data)
+                return True
+            except serial.SerialException as e:
+                print(f"Serial write error on {self.url}: {e}")
+        # Let the reader thread reopen the port
+        self._close()
+        return False
+
+    def _open(self) -> bool:
+        """Open the port, returning whether it succeeded."""
+        # Imported on the reader thread so startup does not load pyserial
+        import serial
+
+        try:
+            port = serial.serial_for_url(self.url, baudrate=self.baudrate, timeout=self.read_timeout)
+        except (serial.SerialException, ValueError) as e:
+            print(f"Failed to connect to ESP8266 on {self.url}: {e}")
+            return False
+        # Notify before publishing the port so writers see a reset state
+        if self.on_connect:
+            self.on_connect()
+        with self._lock:
+            self.serial = port
+        print(f"Connected to ESP8266 on {self.url} at {self.baudrate} baud")
+        return True
+
+    def _close(self):
+        """Close the port if it is open."""
+        import serial
+
+        with self._lock:
+            port, self.serial = self.serial, None
+        if port is not None and port.is_open:
+            try:
+                port.close()
+            except serial.SerialException:
+                pass
+
+    def _run(self):
+        """Keep the port open and dispatch received lines until stopped."""
+        import serial
+
+        delay = self.reconnect_min
+        buffer = bytearray()
+        while self.running:
+            if not self.connected:
+                if not self._open():
+                    self._stopped.wait(delay)
+                    delay = min(delay * 2, self.reconnect_max)
+                    continue
+                delay = self.reconnect_min
+                buffer.clear()
+
+            try:
+                port = self.serial
+                # Blocks for at most read_timeout, then returns what arrived
+                buffer += port.read(port.in_waiting or 1)
+            except (serial.SerialException, AttributeError, TypeError, OSError) as e:
+                # AttributeError/TypeError/OSError: the port was closed under the read
+                if self.running:
+                    print(f"Serial communication error on {self.url}: {e}")
+                self._close()
+                continue
+
+            # A line may arrive over several reads, so only complete lines are dispatched
+            while b'\n' in buffer:
+                raw, _, rest = bytes(buffer).partition(b'\n')
+                buffer[:] = rest
+                self._dispatch(raw)
+
+    def _dispatch(self, raw: bytes):
+        """Pass one received line to the line handler."""
+        line = raw.decode('ascii', errors='replace').strip()
+        if line and self.on_line:
+            try:
+                self.on_line(line)
+            except Exception as e:
+                print(f"Error handling PLC data {line!r}: {e}")
@@ -2,31 +2,61 @@
 Sound utilities for playing audio feedback.
 """
 import os
-import pygame
-import pyttsx3
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+from ..config import TTS_CONFIG
+from .sound_bank import SoundBank
+from .phrase_cache import PhraseCache
+
+if TYPE_CHECKING:
+    import pygame
 
 class SoundManager:
     """Manages sound playback for the application."""
     
-    def __init__(self, sound_path: str):
+    def __init__(self, sound_path: str, sound_bank: Optional[SoundBank] = None,
+                 phrase_cache: Optional[PhraseCache] = None):
         """Initialize the sound manager.
         
         Args:
             sound_path: Base path for sound files
+            sound_bank: Optional bank of preloaded sounds. The local copies are
+                loaded here and the share is synced in the background.
+            phrase_cache: Optional cache of pre-rendered text-to-speech phrases
         """
         self.sound_path = sound_path
-        self.engine: Optional[pyttsx3.Engine] = None
+        self.sound_bank = sound_bank
+        self.phrase_cache = phrase_cache
+        self.engine = None  # pyttsx3 engine, created on first use
+        # Imported here so importing the application does not load SDL
+        import pygame
         pygame.init()
         
+        if self.sound_bank:
+            # Start from the local copies; a slow share must not delay startup
+            self.sound_bank.load()
+            self.sound_bank.start_sync()
+        
     def play_mp3(self, sound_title: str):
         """Play an MP3 file.
         
+        Preloaded sounds from the sound bank start immediately. Anything else
+        is streamed from the local cache or, failing that, from the share.
+        
         Args:
             sound_title: Name of the sound file without extension
         """
+        sound = self.sound_bank.get(sound_title) if self.sound_bank else None
+        if sound:
+            self._play_sound(sound)
+            return
+            
         path = os.path.join(self.sound_path, f"{sound_title}.mp3")
+        if self.sound_bank and sound_title in self.sound_bank.sound_titles:
+            local_path = self.sound_bank.local_path(sound_title)
+            if os.path.exists(local_path):
+                path = local_path
         
+        import pygame
         pygame.mixer.music.load(path)
         pygame.mixer.music.play()
         while pygame.mixer.music.get_busy():
@@ -34,16 +64,47 @@ class SoundManager:
             
     def stop_mp3(self):
         """Stop currently playing MP3."""
+        import pygame
         pygame.mixer.music.stop()
+        pygame.mixer.stop()
+        
+    def _play_sound(self, sound: "pygame.mixer.Sound"):
+        """Play a decoded sound and wait until it finishes.
+        
+        Args:
+            sound: Preloaded sound
+        """
+        import pygame
+        channel = sound.play()
+        while channel and channel.get_busy():
+            pygame.time.Clock().tick(10)
         
     def speak_text(self, text: str, rate: int = 100):
         """Speak text using text-to-speech.
         
+        With a phrase cache the text is rendered once and replayed from
+        memory like the MP3 alarms. If rendering fails or takes longer than
+        TTS_CONFIG['render_timeout'], the text is spoken directly so the
+        announcement is never lost.
+        
         Args:
             text: Text to speak
             rate: Speech rate (default 100)
         """
+        if self.phrase_cache:
+            try:
+                sound = self.phrase_cache.get_or_render(text, rate, TTS_CONFIG['render_timeout'])
+            except Exception as e:
+                # A timed out phrase keeps rendering and is cached for next time
+                print(f"Phrase '{text}' not ready, speaking it directly: {e!r}")
+                sound = None
+            if sound:
+                self._play_sound(sound)
+                return
+            
         if not self.engine:
+            # Imported here so startup does not pay for the speech driver
+            import pyttsx3
             self.engine = pyttsx3.init()
         self.engine.setProperty('rate', rate)
         self.engine.say(text)
@@ -0,0 +1,118 @@
+"""
+Preloaded in-memory bank of alarm sounds mirrored from the network share.
+"""
+import os
+import shutil
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional
+
+if TYPE_CHECKING:
+    import pygame
+
+class SoundBank:
+    """Mirrors alarm sounds to a local directory and keeps them decoded in memory.
+
+    ``sync`` copies every file named in the sound titles from the share to a
+    local cache, skipping files whose size and mtime already match. ``load``
+    decodes the local copies once into ``pygame.mixer.Sound`` objects, so an
+    alarm starts without any share access or MP3 decoding. ``start_sync``
+    runs the sync on a background thread and reloads only the copied files,
+    so a slow or offline share never delays startup.
+    """
+
+    def __init__(self, source_path: str, cache_path: str, sound_titles: Mapping[str, str]):
+        """Initialize the sound bank.
+
+        Args:
+            source_path: Directory on the share holding the sound files
+            cache_path: Local directory the files are mirrored to
+            sound_titles: Mapping of sound keys to file names
+        """
+        self.source_path = source_path
+        self.cache_path = cache_path
+        self.sound_titles = dict(sound_titles)
+        self.sounds: Dict[str, "pygame.mixer.Sound"] = {}
+        self._sync_thread = None
+
+    def local_path(self, sound_key: str) -> str:
+        """Get the local cache path of a sound.
+
+        Args:
+            sound_key: Key in the sound titles
+        """
+        return os.path.join(self.cache_path, self.sound_titles[sound_key])
+
+    def sync(self) -> List[str]:
+        """Copy new or changed sound files from the share to the local cache.
+
+        Files that cannot be reached keep their existing local copy.
+
+        Returns:
+            Keys of the sounds that were copied
+        """
+        os.makedirs(self.cache_path, exist_ok=True)
+        copied = []
+        for sound_key, file_name in self.sound_titles.items():
+            source = os.path.join(self.source_path, file_name)
+            target = self.local_path(sound_key)
+            try:
+                source_stat = os.stat(source)
+                if os.path.exists(target):
+                    target_stat = os.stat(target)
+                    if (target_stat.st_size == source_stat.st_size
+                            and int(target_stat.st_mtime) == int(source_stat.st_mtime)):
+                        continue
+                # Copy to a temporary name so a failed copy never replaces a good file
+                shutil.copy2(source, target + '.part')
+                os.replace(target + '.part', target)
+                copied.append(sound_key)
+            except OSError as e:
+                print(f"Could not sync sound {file_name}: {e}")
+        print(f"Sound cache synced, {len(copied)} file(s) updated")
+        return copied
+
+    def start_sync(self):
+        """Sync in the background, then reload the sounds that changed."""
+        self._sync_thread = threading.Thread(target=self._sync_and_reload, name="sound-sync", daemon=True)
+        self._sync_thread.start()
+
+    def _sync_and_reload(self):
+        """Sync the local cache and decode the copied files."""
+        try:
+            copied = self.sync()
+        except OSError as e:
+            print(f"Could not sync sounds from {self.source_path}: {e}")
+            return
+        if copied:
+            self.load(copied)
+
+    def load(self, sound_keys: Optional[Iterable[str]] = None):
+        """Decode locally cached sounds into memory.
+
+        Requires ``pygame.mixer`` to be initialized.
+
+        Args:
+            sound_keys: Sounds to (re)load, all of them if omitted
+        """
+        import pygame
+
+        for sound_key in (self.sound_titles if sound_keys is None else sound_keys):
+            path = self.local_path(sound_key)
+            if not os.path.exists(path):
+                continue
+            try:
+                self.sounds[sound_key] = pygame.mixer.Sound(path)
+            except pygame.error as e:
+                print(f"Could not decode sound {path}: {e}")
+        print(f"Loaded {len(self.sounds)} of {len(self.sound_titles)} sounds into memory")
+
+    def get(self, sound_key: str) -> Optional["pygame.mixer.Sound"]:
+        """Get a preloaded sound.
+
+        Args:
+            sound_key: Key in the sound titles
+
+        Returns:
+            The decoded sound or None if it is not in the bank
+        """
+        return self.sounds.get(sound_key)
@@ -0,0 +1,7 @@
+"""
+Make the application packages importable when pytest is run from anywhere.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
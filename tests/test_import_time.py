@@ -0,0 +1,28 @@
+"""
+Startup import budget, measured with python -X importtime.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+
+from check_import_time import DEFAULT_BUDGET_MS, eager_modules, measure, total_ms
+
+# Everything main.py imports at module level; none of it needs a display,
+# audio device, serial port or database
+STARTUP_MODULES = ['main']
+
+
+@pytest.fixture(scope='module')
+def timings():
+    return measure(STARTUP_MODULES)
+
+
+def test_startup_imports_stay_lazy(timings):
+    assert eager_modules(timings) == []
+
+
+def test_startup_import_time_within_budget(timings):
+    assert total_ms(timings) <= DEFAULT_BUDGET_MS
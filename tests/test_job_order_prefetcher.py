@@ -0,0 +1,37 @@
+"""
+Selection of the job orders JobOrderPrefetcher loads ahead of the line.
+"""
+import threading
+
+from src.utils.job_order_prefetcher import JobOrderPrefetcher
+
+
+def upcoming(rows, lookahead=3):
+    prefetcher = JobOrderPrefetcher(None, threading.Lock(), lambda job_order: None, lookahead=lookahead)
+    return prefetcher.upcoming_job_orders(
+        [{"Job Order No": job_order, "Checking": checking} for job_order, checking in rows]
+    )
+
+
+def test_current_job_order_comes_first_even_when_done():
+    assert upcoming([("JO-1", ""), ("JO-2", "Done")]) == ["JO-2", "JO-1"]
+
+
+def test_job_order_is_skipped_once_its_newest_row_is_done():
+    rows = [("JO-1", ""), ("JO-2", ""), ("JO-1", "Done"), ("JO-3", "")]
+    assert upcoming(rows) == ["JO-3", "JO-2"]
+
+
+def test_job_order_reopened_after_done_is_prefetched():
+    rows = [("JO-1", "Done"), ("JO-2", ""), ("JO-1", ""), ("JO-3", "")]
+    assert upcoming(rows) == ["JO-3", "JO-1", "JO-2"]
+
+
+def test_duplicates_and_blank_job_orders_are_ignored():
+    rows = [("JO-1", ""), ("", ""), ("JO-1", ""), ("JO-2", ""), ("JO-2", "")]
+    assert upcoming(rows) == ["JO-2", "JO-1"]
+
+
+def test_lookahead_limits_the_job_orders_besides_the_current_one():
+    rows = [(f"JO-{n}", "") for n in range(1, 7)]
+    assert upcoming(rows, lookahead=2) == ["JO-6", "JO-5", "JO-4"]
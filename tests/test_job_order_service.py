@@ -0,0 +1,53 @@
+"""
+JobOrderService lookups against job orders whose workbook is missing.
+"""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.job_order_service import JobOrderMaterials, JobOrderService
+
+
+@pytest.fixture
+def share(tmp_path):
+    """A JobOrderSerials.csv and a directory of one-material-per-line workbooks."""
+    csv_path = tmp_path / "JobOrderSerials.csv"
+    csv_path.write_text("Job Order No,Serial\n")
+
+    def start(job_order):
+        with open(csv_path, "a") as f:
+            f.write(f"{job_order},1\n")
+
+    def publish(job_order, materials):
+        (tmp_path / f"{job_order}.txt").write_text("\n".join(materials))
+
+    service = JobOrderService(
+        str(csv_path),
+        lambda job_order: [str(tmp_path / f"{job_order}.txt")],
+        lambda path: frozenset(open(path).read().split()),
+        revalidate_interval=0, negative_ttl=30.0, current_negative_ttl=0.2,
+    )
+    yield SimpleNamespace(start=start, publish=publish, service=service)
+    service.close()
+
+
+def test_new_job_order_without_a_workbook_keeps_the_previous_job_order(share):
+    share.publish("JO-1", ["A", "B"])
+    share.start("JO-1")
+    assert share.service.lookup() == JobOrderMaterials("JO-1", frozenset({"A", "B"}))
+
+    share.start("JO-2")
+    assert share.service.lookup() == JobOrderMaterials("JO-1", frozenset({"A", "B"}))
+
+
+def test_workbook_of_the_running_job_order_is_found_after_the_short_ttl(share):
+    share.start("JO-2")
+    # A prefetch caches the miss for the long TTL
+    assert share.service.materials_for("JO-2") is None
+    assert share.service.lookup() == JobOrderMaterials("", frozenset())
+
+    share.publish("JO-2", ["C"])
+    assert share.service.materials_for("JO-2") is None
+    time.sleep(0.3)
+    assert share.service.lookup() == JobOrderMaterials("JO-2", frozenset({"C"}))
@@ -0,0 +1,181 @@
+"""
+ProcessController and AsyncProcessController driven through InMemoryChangeSource.
+"""
+import datetime
+import queue
+import threading
+import time
+
+import pytest
+
+from src.config import PROCESS_CONFIGS
+from src.controllers.async_process_controller import AsyncProcessController
+from src.controllers.process_controller import ProcessController
+from src.database.change_source import InMemoryChangeSource
+from src.models.process import Process
+from src.utils.job_order_service import JobOrderMaterials
+
+PROCESS = 5
+MODEL_CODE = PROCESS_CONFIGS[PROCESS]['model_codes'][0]
+MATERIAL_COLUMNS = list(PROCESS_CONFIGS[PROCESS]['material_checks'].values())
+
+
+class FakeSoundManager:
+    """Records what would be played and on which thread."""
+
+    def __init__(self):
+        self.played = []
+
+    def play_mp3(self, sound_title):
+        self.played.append((sound_title, threading.current_thread().name))
+
+    def speak_text(self, text, rate=100):
+        self.played.append((text, threading.current_thread().name))
+
+    def stop_mp3(self):
+        pass
+
+
+class FakeJobOrders:
+    """Job order lookup with a fixed material list."""
+
+    def __init__(self, materials):
+        self.result = JobOrderMaterials("JO-1", frozenset(materials))
+
+    def lookup(self):
+        return self.result
+
+
+def make_row(second, material):
+    row = {
+        f'Process_{PROCESS}_DateTime': datetime.datetime(2024, 1, 1, 8, 0, second),
+        f'Process {PROCESS} Repaired Action': '-',
+        f'Process {PROCESS} Model Code': MODEL_CODE,
+    }
+    row.update({column: material for column in MATERIAL_COLUMNS})
+    return row
+
+
+def make_controller(controller_class=ProcessController):
+    """Build a controller whose decisions are reported on a queue."""
+    processes = {
+        PROCESS: Process(PROCESS, PROCESS_CONFIGS[PROCESS]['csv_path'], PROCESS_CONFIGS[PROCESS]['model_codes'],
+                         PROCESS_CONFIGS[PROCESS]['material_checks'])
+    }
+    source = InMemoryChangeSource()
+    controller = controller_class(processes, FakeSoundManager(), change_source=source,
+                                  job_orders=FakeJobOrders({"GOOD"}))
+    controller._show_correct_temporary = lambda process: process.show_correct()
+    decisions = queue.Queue()
+    observe_decision = controller._observe_decision
+
+    def record_decision(process, data, seen_at, decision):
+        observe_decision(process, data, seen_at, decision)
+        decisions.put((data[f'Process_{PROCESS}_DateTime'].second, decision))
+
+    controller._observe_decision = record_decision
+    return controller, source, decisions
+
+
+def next_decisions(decisions, count):
+    return [decisions.get(timeout=5) for _ in range(count)]
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def running_controller():
+    controller, source, decisions = make_controller()
+    controller.start_monitoring()
+    yield controller, source, decisions
+    controller.stop_monitoring()
+
+
+def test_correct_row_does_not_clear_an_unacknowledged_error(running_controller):
+    controller, source, decisions = running_controller
+    process = controller.processes[PROCESS]
+
+    source.publish(PROCESS, make_row(1, "WRONG"))
+    source.publish(PROCESS, make_row(2, "GOOD"))
+
+    assert next_decisions(decisions, 2) == [(1, "alarm"), (2, "correct")]
+    assert process.has_error()
+    assert controller.alarm_manager.is_pending(PROCESS)
+
+
+def test_correct_rows_clear_the_state_again_after_a_reset(running_controller):
+    controller, source, decisions = running_controller
+    process = controller.processes[PROCESS]
+
+    source.publish(PROCESS, make_row(1, "WRONG"))
+    assert next_decisions(decisions, 1) == [(1, "alarm")]
+    # What the reset button and the PLC STOP input do
+    process.reset_state()
+    assert wait_until(lambda: not controller.alarm_manager.is_pending(PROCESS))
+
+    source.publish(PROCESS, make_row(2, "GOOD"))
+    assert next_decisions(decisions, 1) == [(2, "correct")]
+    assert not process.has_error()
+
+
+def test_asyncio_engine_plays_alarms_through_the_alarm_manager():
+    controller, source, decisions = make_controller(AsyncProcessController)
+    controller.start_monitoring()
+    try:
+        source.publish(PROCESS, make_row(1, "WRONG"))
+        assert next_decisions(decisions, 1) == [(1, "alarm")]
+        assert controller.alarm_manager.is_pending(PROCESS)
+        assert wait_until(lambda: controller.sound_manager.played)
+    finally:
+        controller.stop_monitoring()
+    assert {thread for _, thread in controller.sound_manager.played} == {"alarm-worker"}
+
+
+def test_rows_are_validated_in_the_order_they_were_published(running_controller):
+    controller, source, decisions = running_controller
+
+    for second in range(1, 11):
+        source.publish(PROCESS, make_row(second, "GOOD"))
+
+    assert next_decisions(decisions, 10) == [(second, "correct") for second in range(1, 11)]
+    assert controller.last_processed_datetime[PROCESS].second == 10
+
+
+def test_rows_published_together_are_delivered_in_one_batch():
+    source = InMemoryChangeSource()
+    source.publish(PROCESS, make_row(1, "GOOD"))
+    source.publish(PROCESS, make_row(2, "GOOD"))
+
+    changes = source.wait_for_changes(0)
+
+    assert [row[f'Process_{PROCESS}_DateTime'].second for row in changes[PROCESS]] == [1, 2]
+    assert source.wait_for_changes(0) == {}
+
+
+def test_stop_wakes_up_a_pending_wait():
+    source = InMemoryChangeSource()
+    results = queue.Queue()
+    waiter = threading.Thread(target=lambda: results.put(source.wait_for_changes(60)))
+    waiter.start()
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    source.stop()
+    waiter.join(5)
+
+    assert not waiter.is_alive()
+    assert time.monotonic() - started < 1
+    assert results.get_nowait() == {}
+
+    # A restarted source waits again
+    source.start()
+    started = time.monotonic()
+    assert source.wait_for_changes(0.2) == {}
+    assert time.monotonic() - started >= 0.15
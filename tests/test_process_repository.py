@@ -0,0 +1,144 @@
+"""
+Cursor polling through ProcessRepository against an SQLite stand-in for MariaDB.
+"""
+import datetime
+import random
+import sqlite3
+
+import pytest
+
+from src.database import process_repository
+from src.database.change_source import PollingChangeSource
+from src.database.process_repository import ProcessRepository, SchemaError
+
+PROCESS = 5
+TABLE = 'process5_data'
+DATETIME_COLUMN = f'Process_{PROCESS}_DateTime'
+
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+
+
+class SQLiteConnection:
+    """Answers the repository's queries from an in-memory SQLite database.
+
+    Result sets are shuffled so only an explicit ORDER BY, never the
+    insertion order, decides which rows a cursor sees.
+    """
+
+    def __init__(self, primary_key=True):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        key = "INTEGER PRIMARY KEY" if primary_key else "INTEGER"
+        self.conn.execute(f"CREATE TABLE {TABLE} (id {key}, {DATETIME_COLUMN} TEXT, serial TEXT)")
+        self.primary_key = primary_key
+        self.shuffle = random.Random(0).shuffle
+
+    def insert(self, second, serial):
+        self.conn.execute(
+            f"INSERT INTO {TABLE} ({DATETIME_COLUMN}, serial) VALUES (?, ?)",
+            (datetime.datetime(2024, 1, 1, 8, 0, second), serial)
+        )
+
+    def execute_query(self, query, params=None):
+        if "information_schema.STATISTICS" in query and "NON_UNIQUE = 0" in query:
+            if not self.primary_key:
+                return []
+            return [{'INDEX_NAME': 'PRIMARY', 'COLUMN_NAME': 'id'}]
+        if "information_schema.COLUMNS" in query:
+            return [{'COLUMN_NAME': row['name']} for row in self.conn.execute(f"PRAGMA table_info({TABLE})")]
+        if "information_schema" in query:
+            return []
+        return self._select(query, params or ())
+
+    def execute_multi(self, query, params=None):
+        params = list(params or ())
+        results = []
+        for statement in query.split(";\n"):
+            count = statement.count("%s")
+            results.append(self._select(statement, tuple(params[:count])))
+            del params[:count]
+        return results
+
+    def _select(self, query, params):
+        if query.startswith("(") and "UNION ALL" not in query:
+            # SQLite rejects a lone parenthesized SELECT
+            query = query[1:-1]
+        rows = [dict(row) for row in self.conn.execute(query.replace("%s", "?"), params)]
+        self.shuffle(rows)
+        return rows
+
+
+@pytest.fixture
+def database(monkeypatch):
+    db = SQLiteConnection()
+    monkeypatch.setattr(process_repository, "DatabaseConnection", lambda: db)
+    monkeypatch.setitem(process_repository.POLLING_CONFIG, 'persistent_connection', False)
+    return db
+
+
+def poll(source):
+    return [row['serial'] for row in source.wait_for_changes(0).get(PROCESS, [])]
+
+
+def test_rows_written_in_the_same_second_are_delivered_once_in_order(database):
+    for serial in ["A", "B"]:
+        database.insert(0, serial)
+    source = PollingChangeSource(ProcessRepository(), [PROCESS], mode='cursor', interval=0, batch_size=2)
+
+    # The first poll starts at the newest row, like the latest-row poller
+    assert poll(source) == ["B"]
+
+    for serial in ["C", "D", "E", "F", "G"]:
+        database.insert(1, serial)
+    delivered = poll(source) + poll(source)
+    database.insert(1, "H")
+    database.insert(2, "I")
+    while True:
+        rows = poll(source)
+        if not rows:
+            break
+        delivered += rows
+
+    assert delivered == ["C", "D", "E", "F", "G", "H", "I"]
+    assert source.cursors[PROCESS].key == 9
+
+
+def test_optional_columns_missing_from_the_table_are_skipped(database):
+    database.insert(0, "A")
+    repository = ProcessRepository({PROCESS: [DATETIME_COLUMN, 'serial', 'Process 5 Stale Column']})
+    source = PollingChangeSource(repository, [PROCESS], mode='cursor', interval=0)
+
+    assert poll(source) == ["A"]
+    assert repository._projected_columns(PROCESS) == [DATETIME_COLUMN, 'serial', 'id']
+
+
+def test_required_columns_are_fetched_even_if_not_configured(database):
+    database.insert(0, "A")
+    repository = ProcessRepository({PROCESS: []}, {PROCESS: ['serial']})
+    source = PollingChangeSource(repository, [PROCESS], mode='latest', interval=0)
+
+    assert poll(source) == ["A"]
+    assert repository._projected_columns(PROCESS) == [DATETIME_COLUMN, 'serial']
+
+
+@pytest.mark.parametrize("columns", [[DATETIME_COLUMN, 'serial', 'Process 5 Model Code'], []])
+def test_process_without_its_required_columns_is_not_polled(database, columns):
+    database.insert(0, "A")
+    repository = ProcessRepository({PROCESS: columns}, {PROCESS: ['Process 5 Model Code']})
+
+    for mode in ['cursor', 'latest']:
+        source = PollingChangeSource(repository, [PROCESS], mode=mode, interval=0)
+        with pytest.raises(SchemaError):
+            source.wait_for_changes(0)
+        assert source.process_numbers == []
+
+
+def test_process_table_without_a_unique_key_is_not_polled(monkeypatch):
+    db = SQLiteConnection(primary_key=False)
+    monkeypatch.setattr(process_repository, "DatabaseConnection", lambda: db)
+    db.insert(0, "A")
+    source = PollingChangeSource(ProcessRepository(), [PROCESS], mode='cursor', interval=0)
+
+    with pytest.raises(SchemaError):
+        source.wait_for_changes(0)
+    assert source.process_numbers == []
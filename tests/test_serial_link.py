@@ -0,0 +1,143 @@
+"""
+SerialLink and PLCController over pyserial's loop:// port.
+"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("serial")
+
+from src.config import PROCESS_CONFIGS
+from src.controllers.plc_controller import PLCController
+from src.models.process import Process
+from src.utils.plc_protocol import FRAME_HEADER, StatusFrame, decode_frame, encode_frame
+from src.utils.serial_link import SerialLink
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def make_processes(*process_numbers):
+    return {
+        n: Process(n, PROCESS_CONFIGS[n]['csv_path'], PROCESS_CONFIGS[n]['model_codes'],
+                   PROCESS_CONFIGS[n]['material_checks'])
+        for n in process_numbers
+    }
+
+
+def make_plc(processes, protocol):
+    plc = PLCController('loop://', 9600, processes, {
+        'protocol': protocol, 'poll_interval': 0.01, 'keepalive_interval': 60.0, 'read_timeout': 0.05,
+    })
+    sent = []
+    write = plc.link.write
+
+    def record_write(data):
+        written = write(data)
+        if written:
+            sent.append(data)
+        return written
+
+    plc.link.write = record_write
+    return plc, sent
+
+
+def test_written_bytes_reach_the_port_unchanged():
+    link = SerialLink('loop://', 9600, read_timeout=0.1)
+    assert link._open()
+    try:
+        frame = encode_frame(0b100101, 7, 1)
+        assert link.write(b'H' + frame)
+        assert link.serial.read(1 + len(frame)) == b'H' + frame
+    finally:
+        link._close()
+    assert not link.write(b'L')
+
+
+def test_received_lines_are_passed_to_the_handler():
+    lines = []
+    link = SerialLink('loop://', 9600, on_line=lines.append, read_timeout=0.05)
+    link.start()
+    try:
+        assert wait_until(lambda: link.connected)
+        link.write(b'1,ERR')
+        link.write(b'OR\r\n2,OK\n')
+        assert wait_until(lambda: len(lines) == 2)
+    finally:
+        link.stop()
+    assert lines == ['1,ERROR', '2,OK']
+    assert not link.connected
+
+
+def test_reconnect_delay_doubles_up_to_the_maximum():
+    link = SerialLink('bogus://port', 9600, reconnect_min=0.01, reconnect_max=0.05)
+    delays = []
+
+    def record_wait(delay):
+        delays.append(delay)
+        if len(delays) == 5:
+            link.running = False
+        return False
+
+    link._stopped.wait = record_wait
+    link.running = True
+    link._run()
+
+    assert delays == [0.01, 0.02, 0.04, 0.05, 0.05]
+
+
+def test_lost_port_is_reopened():
+    connects = []
+    link = SerialLink('loop://', 9600, on_connect=lambda: connects.append(time.monotonic()),
+                      read_timeout=0.05, reconnect_min=0.01)
+    link.start()
+    try:
+        assert wait_until(lambda: link.connected)
+        link.serial.close()
+        assert wait_until(lambda: len(connects) == 2 and link.connected)
+        assert link.write(b'L')
+    finally:
+        link.stop()
+
+
+def test_signal_is_written_only_when_it_changes():
+    processes = make_processes(1)
+    plc, sent = make_plc(processes, 'legacy')
+    plc.start()
+    try:
+        assert wait_until(lambda: sent == [b'L'])
+        time.sleep(0.1)
+        assert sent == [b'L']
+
+        processes[1].set_error("Wrong material")
+        assert wait_until(lambda: sent == [b'L', b'H'])
+        time.sleep(0.1)
+        processes[1].reset_state()
+        assert wait_until(lambda: sent == [b'L', b'H', b'L'])
+    finally:
+        plc.stop()
+    assert sent == [b'L', b'H', b'L', b'L']
+
+
+def test_status_frames_carry_one_error_bit_per_process():
+    processes = make_processes(1, 3)
+    plc, sent = make_plc(processes, 'frame')
+    plc.start()
+    try:
+        assert wait_until(lambda: len(sent) == 1)
+        processes[3].set_error("Wrong material")
+        assert wait_until(lambda: len(sent) == 2)
+    finally:
+        plc.stop()
+
+    assert sent[1] == FRAME_HEADER + bytes([1, 0b100, 1, 1 ^ 0b100 ^ 1])
+    assert [decode_frame(frame) for frame in sent] == [
+        StatusFrame(0, 0), StatusFrame(0b100, 1), StatusFrame(0, 2)
+    ]
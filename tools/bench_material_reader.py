@@ -0,0 +1,104 @@
+"""
+Benchmark the material list readers against pd.read_excel.
+
+    python tools/bench_material_reader.py path/to/JO-1234.xlsx ...
+    python tools/bench_material_reader.py --generate 200 1000 5000
+
+With --generate, workbooks with a material list layout and the given row
+counts are written to a temporary directory first. Peak memory is measured
+with tracemalloc, so it covers Python allocations only (calamine's Rust
+parser is not included).
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.material_reader import read_material_column_calamine, read_material_column_openpyxl
+
+
+def read_material_column_pandas(path: str, column: str = "Material"):
+    """The original reader: whole sheet into a DataFrame, then one column."""
+    import pandas as pd
+
+    materials = pd.read_excel(path)
+    return frozenset(material for material in materials[column] if pd.notna(material))
+
+
+BACKENDS = {
+    'pandas': read_material_column_pandas,
+    'calamine': read_material_column_calamine,
+    'openpyxl': read_material_column_openpyxl,
+}
+
+
+def generate_workbook(directory: str, rows: int) -> str:
+    """Write a workbook shaped like a job order material list."""
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["No", "Material", "Description", "Qty", "Unit", "Supplier", "Remarks"])
+    for index in range(1, rows + 1):
+        sheet.append([
+            index, f"60MAT{index % 997:04d}P", f"Component description {index}",
+            index % 12 + 1, "PCS", f"Supplier {index % 23}", "" if index % 5 else "Check lot"
+        ])
+    path = os.path.join(directory, f"materials-{rows}.xlsx")
+    workbook.save(path)
+    return path
+
+
+def measure(reader, path: str, repeat: int):
+    """Return (median seconds, peak traced bytes, result) of a reader."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = reader(path)
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    reader(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak, result
+
+
+def main():
+    """Run the benchmark and print one table row per workbook and backend."""
+    parser = argparse.ArgumentParser(description="Benchmark the material list readers.")
+    parser.add_argument('paths', nargs='*', help="material list workbooks")
+    parser.add_argument('--generate', type=int, nargs='*', default=[], metavar='ROWS',
+                        help="generate workbooks with these row counts")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per backend")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = list(args.paths) + [generate_workbook(directory, rows) for rows in args.generate]
+        if not paths:
+            parser.error("give workbook paths or --generate ROWS")
+
+        print(f"{'workbook':<28}{'backend':<10}{'median ms':>12}{'peak KiB':>12}{'materials':>11}")
+        for path in paths:
+            baseline = None
+            for name, reader in BACKENDS.items():
+                try:
+                    seconds, peak, result = measure(reader, path, args.repeat)
+                except ImportError as e:
+                    print(f"{os.path.basename(path):<28}{name:<10}  skipped ({e.name} not installed)")
+                    continue
+                if baseline is None:
+                    baseline = result
+                elif result != baseline:
+                    print(f"  {name} returned different materials than the first backend")
+                print(f"{os.path.basename(path):<28}{name:<10}{1000 * seconds:>12.2f}{peak / 1024:>12.0f}{len(result):>11}")
+
+
+if __name__ == '__main__':
+    main()
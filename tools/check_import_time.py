@@ -0,0 +1,92 @@
+"""
+Check the startup import cost against a budget using python -X importtime.
+
+    python tools/check_import_time.py --budget-ms 800
+
+Exits with status 1 when the imports take longer than the budget or pull in
+a module that must only be loaded lazily. tests/test_import_time.py runs the
+same check under pytest.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded on first use only, never while the application starts
+LAZY_MODULES = ('pandas', 'numpy', 'openpyxl', 'python_calamine', 'xlrd', 'keyboard', 'pyttsx3',
+                'pygame', 'serial', 'mysql', 'tkinter', 'customtkinter')
+
+DEFAULT_BUDGET_MS = 800.0
+
+
+class ImportTiming(NamedTuple):
+    """One line of -X importtime output."""
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def measure(modules: List[str]) -> List[ImportTiming]:
+    """Import modules in a fresh interpreter and parse its import timings."""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        stripped = name.lstrip()
+        timings.append(ImportTiming(stripped, (len(name) - len(stripped) - 1) // 2,
+                                    int(self_us), int(cumulative_us)))
+    return timings
+
+
+def total_ms(timings: List[ImportTiming]) -> float:
+    """Sum the cumulative time of the top-level imports, in milliseconds."""
+    return sum(timing.cumulative_us for timing in timings if timing.depth == 0) / 1000
+
+
+def eager_modules(timings: List[ImportTiming]) -> List[str]:
+    """Get the lazy-only top-level packages that were imported anyway."""
+    return sorted({timing.name.split('.')[0] for timing in timings} & set(LAZY_MODULES))
+
+
+def main():
+    """Measure, report and enforce the import budget."""
+    parser = argparse.ArgumentParser(description="Check the startup import time budget.")
+    parser.add_argument('--module', action='append', dest='modules',
+                        help="module to import, repeatable (default: main)")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help="maximum total import time")
+    parser.add_argument('--top', type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args()
+    modules = args.modules or ['main']
+
+    timings = measure(modules)
+    elapsed_ms = total_ms(timings)
+    print(f"Import time of {', '.join(modules)}: {elapsed_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for timing in sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:args.top]:
+        print(f"  {timing.cumulative_us / 1000:9.1f} ms  {timing.name}")
+
+    failed = False
+    eager = eager_modules(timings)
+    if eager:
+        print(f"Imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if elapsed_ms > args.budget_ms:
+        print(f"Import time exceeds the budget by {elapsed_ms - args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Replay a recorded production day through the material validation.
+
+Record with WMD_RECORD_PATH=day.jsonl.gz set while main.py runs, then:
+
+    python tools/replay.py day.jsonl.gz --speed max
+"""
+import argparse
+import contextlib
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import PROCESS_CONFIGS
+from src.models.process import Process
+from src.controllers.process_controller import ProcessController
+from src.database.change_source import InMemoryChangeSource
+from src.utils.replay import Replayer, ReplayJobOrders
+
+
+def parse_speed(value: str):
+    """Parse '1', '10x' or 'max' into a playback speed, None meaning as fast as possible."""
+    value = value.lower()
+    if value == 'max':
+        return None
+    speed = float(value.rstrip('x'))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def main():
+    """Replay a recording and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('recording', help="gzip JSON lines file written with WMD_RECORD_PATH")
+    parser.add_argument('--speed', type=parse_speed, default=None,
+                        help="playback speed: 1, 10x, ... or max (default)")
+    parser.add_argument('--quiet', action='store_true', help="hide the controller's per-row output")
+    args = parser.parse_args()
+
+    processes = {
+        num: Process(num, config['csv_path'], config['model_codes'], config['material_checks'])
+        for num, config in PROCESS_CONFIGS.items()
+    }
+    job_orders = ReplayJobOrders()
+    controller = ProcessController(processes, None, change_source=InMemoryChangeSource(), job_orders=job_orders)
+    replayer = Replayer(controller, job_orders, args.speed)
+    if args.quiet:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            report = replayer.replay(args.recording)
+    else:
+        report = replayer.replay(args.recording)
+    print(report.format())
+
+
+if __name__ == '__main__':
+    main()